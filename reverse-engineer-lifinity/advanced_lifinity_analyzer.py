@@ -13,14 +13,13 @@ import os
 import sys
 import re
 import asyncio
+import heapq
 from typing import Dict, List, Tuple, Any, Union
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
+from functools import lru_cache
 from datetime import datetime, timedelta
 from pathlib import Path
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Solana imports
@@ -32,9 +31,14 @@ from solders.rpc.responses import GetTransactionResp
 from solders.transaction import VersionedTransaction
 from solders.message import MessageV0
 import requests
-import base58
+import httpx
 from construct import *
 
+try:
+    import based58 as b58  # Rust base58 codec; same bytes-in/bytes-out API
+except ImportError:
+    import base58 as b58
+
 # Constants
 LIFINITY_V2_PROGRAM_ID = "2wT8Yq49kHgDzXuPxZSaeLaH1qbmGXtEyPy64bL7aD3c"
 RPC_URL = "https://api.mainnet-beta.solana.com"
@@ -57,15 +61,62 @@ PYTH_PRICE_ACCOUNTS = {
     "SOL/USD": "J83w4HKfqxwcq3BEMMkPFSppX3gqekLyLJBexebFVkix",
     "USDC/USD": "Gnt27xtC473ZT2Mw5u8wZ68Z3gULkSTb5DuxJy7eJotD",
     "USDT/USD": "3vxLXJqLqF3JG5TCbYycbKWRBbCJQLxQmBGCkyqEEefL",
-    "mSOL/USD": "E4v1BBgoso9s64TjV1viAycbvG2QBGJZPIDjRn9YPUn",
+    "mSOL/USD": "E4v1BBgoso9s64TQvmyownAVJbhbEPGyzA3qn4n46qj9",
     "JitoSOL/USD": "7yyaeuJ1GGtVBLT2z2xub5ZWYKaNhF28mj1RdV4VDFVk",
     "bSOL/USD": "AFrYBhb5wKQtxRS9UA9YRS4V3dwFm7SqmS6DHKq6YVgo"
 }
 
-@dataclass
+# Sampled instruction accounts: index into TransactionAnalyzer.keys plus meta flags
+ACCOUNT_META_DTYPE = np.dtype([
+    ('key', np.int32),
+    ('is_signer', np.bool_),
+    ('is_writable', np.bool_),
+])
+
+_U64 = struct.Struct('<Q')  # Little-endian u64 amount after the discriminator
+
+def _shape_name(data_len: int, acc_count: int) -> str:
+    """Instruction name for a data/account shape; empty when unrecognized"""
+    # Common patterns
+    if data_len == 8:
+        if acc_count <= 2:
+            return "query_state"
+        else:
+            return "admin_action"
+    elif data_len == 16:  # 8 byte discriminator + 8 byte amount
+        if acc_count >= 6:
+            return "swap_exact_input"
+        else:
+            return "deposit_single"
+    elif data_len == 24:  # More data
+        if acc_count >= 6:
+            return "swap_exact_output"
+        else:
+            return "withdraw"
+    elif data_len > 100:  # Lots of initialization data
+        return "initialize_pool"
+    elif 24 < data_len <= 48:
+        return "update_params"
+    return ""
+
+# Names indexed [data_len][acc_count]; no rule distinguishes counts above 6,
+# and data past 48 bytes only splits at the initialize_pool threshold
+SHAPE_NAMES = [[_shape_name(data_len, acc_count) for acc_count in range(7)] for data_len in range(49)]
+
+@lru_cache(maxsize=1024)
+def _unknown_name(data_len: int, acc_count: int) -> str:
+    """Shared name string for an unrecognized shape"""
+    return f"unknown_{data_len}b_{acc_count}acc"
+
+@lru_cache(maxsize=4096)
+def _ts_to_dt(ts: int) -> datetime:
+    """Block time to datetime; transactions in the same slot share a timestamp"""
+    return datetime.fromtimestamp(ts)
+
+@dataclass(slots=True)
 class InstructionInfo:
     """Detailed instruction information"""
-    discriminator: str
+    discriminator: bytes  # Raw 8 bytes; hex-encoded only when reported
     name: str
     account_count: int
     data_size: int
@@ -73,9 +124,9 @@ class InstructionInfo:
     account_patterns: List[str] = field(default_factory=list)
     data_pattern: str | None = None
     is_admin: bool = False
-    typical_accounts: List[Dict[str, Any]] = field(default_factory=list)
+    typical_accounts: List[np.ndarray] = field(default_factory=list)  # ACCOUNT_META_DTYPE rows
 
-@dataclass
+@dataclass(slots=True)
 class PoolStateField:
     """Pool state field definition"""
     offset: int
@@ -85,7 +136,7 @@ class PoolStateField:
     value: Any | None = None
     description: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class SwapData:
     """Detailed swap transaction data"""
     tx_id: str
@@ -103,7 +154,7 @@ class SwapData:
     realized_price: float | None = None
     slippage_bps: float | None = None
 
-@dataclass
+@dataclass(slots=True)
 class OraclePriceData:
     """Pyth oracle price data"""
     price: float
@@ -245,7 +296,7 @@ class BinaryAnalyzer:
                         pass
 
         print(f"  Extracted constants (likely fees/parameters):")
-        for val, count in sorted(constants.items(), key=lambda x: x[1], reverse=True)[:10]:
+        for val, count in heapq.nlargest(10, constants.items(), key=lambda x: x[1]):
             if val <= 10000:
                 print(f"    {val}: {count} occurrences (possibly {val/100:.2f}% if basis points)")
 
@@ -254,11 +305,43 @@ class TransactionAnalyzer:
     """Analyze on-chain transactions"""
 
     def __init__(self, rpc_url=RPC_URL):
+        self.rpc_url = rpc_url
+        self.http = httpx.Client(
+            http2=True,
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=32)
+        )
+
+        # Route solana-py calls over the same pooled HTTP/2 connection
         self.client = Client(rpc_url)
+        self.client._provider.session.close()
+        self.client._provider.session = self.http
+
+        # Transaction batches are fetched concurrently on the event loop
+        self.async_http = None
+        self.fetch_limit = asyncio.Semaphore(20)
+
         self.program_id = Pubkey.from_string(LIFINITY_V2_PROGRAM_ID)
-        self.instruction_map = {}
+        self.instruction_map: Dict[bytes, InstructionInfo] = {}
         self.swap_data = []
 
+        # Interned account keys shared by sampled instructions and swaps
+        self.key_table: Dict[bytes, int] = {}
+        self.keys: List[str] = []
+
+    def close(self):
+        """Release the pooled HTTP/2 connection"""
+        self.http.close()
+
+    def intern_key(self, pubkey) -> int:
+        """Index of an account key in the shared key table, adding it if new"""
+        raw = bytes(pubkey)
+        idx = self.key_table.get(raw)
+        if idx is None:
+            idx = self.key_table[raw] = len(self.keys)
+            self.keys.append(str(pubkey))
+        return idx
+
     async def analyze_recent_transactions(self, limit=1000):
         """Fetch and analyze recent transactions"""
         print("[*] Fetching recent transactions...")
@@ -270,14 +353,24 @@ class TransactionAnalyzer:
                 limit=limit
             )
 
-            signatures = response.value
-            print(f"  Found {len(signatures)} transactions")
+            # Failed transactions carry no useful state, so never fetch them
+            signatures = [s for s in response.value if s.err is None]
+            print(f"  Found {len(response.value)} transactions ({len(signatures)} successful)")
 
-            # Process in batches
+            # Process in batches, all in flight at once
             batch_size = 20
-            for i in range(0, min(len(signatures), 200), batch_size):  # Limit to 200 for speed
-                batch = signatures[i:i+batch_size]
-                await self.process_batch(batch)
+            to_fetch = signatures[:200]  # Limit to 200 for speed
+            batches = [to_fetch[i:i+batch_size] for i in range(0, len(to_fetch), batch_size)]
+
+            self.async_http = httpx.AsyncClient(
+                http2=True,
+                timeout=30,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+            try:
+                await asyncio.gather(*(self.process_batch(batch) for batch in batches))
+            finally:
+                await self.async_http.aclose()
 
             # Analyze instruction patterns
             self.analyze_instruction_patterns()
@@ -288,43 +381,65 @@ class TransactionAnalyzer:
             self.try_backup_rpc()
 
     async def process_batch(self, signatures):
-        """Process a batch of transactions"""
-        for sig_info in signatures:
-            try:
-                # Get full transaction
-                tx_response = self.client.get_transaction(
-                    sig_info.signature,
-                    max_supported_transaction_version=0,
-                    encoding="json"
-                )
+        """Process a batch of transactions fetched in one JSON-RPC batch request"""
+        batch = [
+            {
+                "jsonrpc": "2.0",
+                "id": i,
+                "method": "getTransaction",
+                "params": [
+                    str(sig_info.signature),
+                    {"encoding": "base64", "maxSupportedTransactionVersion": 0}
+                ]
+            }
+            for i, sig_info in enumerate(signatures)
+        ]
 
-                if not tx_response or not tx_response.value:
-                    continue
+        try:
+            async with self.fetch_limit:
+                response = await self.async_http.post(self.rpc_url, json=batch)
+            response.raise_for_status()
+            replies = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"    Error fetching batch: {e}")
+            return
 
-                tx = tx_response.value
-                self.process_transaction(tx, sig_info)
+        if not isinstance(replies, list):
+            print(f"    Batch rejected: {replies}")
+            return
+
+        # Replies may arrive in any order; match them back by id
+        results = {reply.get("id"): reply.get("result") for reply in replies}
+        for i, sig_info in enumerate(signatures):
+            tx = results.get(i)
+            if not tx:
+                continue
 
+            try:
+                self.process_transaction(tx, sig_info)
             except Exception as e:
                 print(f"    Error processing tx: {e}")
 
     def process_transaction(self, tx, sig_info):
-        """Extract instruction data from transaction"""
+        """Extract instruction data from a base64-encoded transaction"""
         try:
-            if not tx.transaction:
+            if not tx.get("transaction"):
                 return
 
-            # Get message from transaction
-            message = tx.transaction.transaction.message
+            # Decode the wire-format transaction locally
+            raw = base64.b64decode(tx["transaction"][0])
+            message = VersionedTransaction.from_bytes(raw).message
 
-            # Find instructions for our program
-            for idx, ix in enumerate(message.instructions):
-                program_idx = ix.program_id_index
+            # Resolve our program's key index once per message
+            try:
+                program_idx = message.account_keys.index(self.program_id)
+            except ValueError:
+                return
 
-                # Check if this instruction is for our program
-                if program_idx < len(message.account_keys):
-                    program_key = str(message.account_keys[program_idx])
-                    if program_key == LIFINITY_V2_PROGRAM_ID:
-                        self.process_instruction(ix, message, sig_info, tx)
+            # Find instructions for our program
+            for ix in message.instructions:
+                if ix.program_id_index == program_idx:
+                    self.process_instruction(ix, message, sig_info, tx)
 
         except Exception as e:
             print(f"    Transaction processing error: {e}")
@@ -333,29 +448,23 @@ class TransactionAnalyzer:
         """Process individual instruction"""
         try:
             # Get instruction data
-            data = base58.b58decode(ix.data) if isinstance(ix.data, str) else bytes(ix.data)
+            data = b58.b58decode(ix.data.encode()) if isinstance(ix.data, str) else bytes(ix.data)
 
             if len(data) < 8:
                 return
 
             # Extract discriminator
-            discriminator = data[:8].hex()
-
-            # Get account metas
-            accounts = []
-            for acc_idx in ix.accounts:
-                if acc_idx < len(message.account_keys):
-                    accounts.append({
-                        'pubkey': str(message.account_keys[acc_idx]),
-                        'is_signer': acc_idx < message.header.num_required_signatures,
-                        'is_writable': acc_idx < message.header.num_readonly_signed_accounts or
-                                      (acc_idx >= message.header.num_required_signatures and
-                                       acc_idx < message.header.num_required_signatures + message.header.num_readonly_unsigned_accounts)
-                    })
+            discriminator = data[:8]
+
+            # Account positions in the message key table
+            account_keys = message.account_keys
+            key_count = len(account_keys)
+            accounts = [acc_idx for acc_idx in ix.accounts if acc_idx < key_count]
 
             # Store instruction info
-            if discriminator not in self.instruction_map:
-                self.instruction_map[discriminator] = InstructionInfo(
+            info = self.instruction_map.get(discriminator)
+            if info is None:
+                info = self.instruction_map[discriminator] = InstructionInfo(
                     discriminator=discriminator,
                     name=self.infer_instruction_name(data, accounts),
                     account_count=len(accounts),
@@ -365,64 +474,60 @@ class TransactionAnalyzer:
                     typical_accounts=[]
                 )
 
-            self.instruction_map[discriminator].frequency += 1
+            info.frequency += 1
 
             # Store sample accounts
-            if len(self.instruction_map[discriminator].typical_accounts) < 3:
-                self.instruction_map[discriminator].typical_accounts.append(accounts)
+            if len(info.typical_accounts) < 3:
+                info.typical_accounts.append(self.account_metas(accounts, account_keys, message.header))
 
             # Try to extract swap data if this looks like a swap
             if self.is_likely_swap(data, accounts):
-                self.extract_swap_data(ix, message, sig_info, tx, data, accounts)
+                self.extract_swap_data(ix, message, sig_info, tx, data, accounts, account_keys)
 
         except Exception as e:
             print(f"    Instruction processing error: {e}")
 
+    def account_metas(self, accounts, account_keys, header) -> np.ndarray:
+        """Interned keys and signer/writable flags for one instruction's accounts"""
+        num_signers = header.num_required_signatures
+        positions = np.asarray(accounts, dtype=np.int32)
+
+        metas = np.empty(len(accounts), dtype=ACCOUNT_META_DTYPE)
+        metas['key'] = [self.intern_key(account_keys[acc_idx]) for acc_idx in accounts]
+        metas['is_signer'] = positions < num_signers
+        metas['is_writable'] = (positions < header.num_readonly_signed_accounts) | (
+            (positions >= num_signers) &
+            (positions < num_signers + header.num_readonly_unsigned_accounts)
+        )
+        return metas
+
     def infer_instruction_name(self, data, accounts):
         """Infer instruction type from patterns"""
         data_len = len(data)
         acc_count = len(accounts)
-
-        # Common patterns
-        if data_len == 8:
-            if acc_count <= 2:
-                return "query_state"
-            else:
-                return "admin_action"
-        elif data_len == 16:  # 8 byte discriminator + 8 byte amount
-            if acc_count >= 6:
-                return "swap_exact_input"
-            else:
-                return "deposit_single"
-        elif data_len == 24:  # More data
-            if acc_count >= 6:
-                return "swap_exact_output"
-            else:
-                return "withdraw"
-        elif data_len > 100:  # Lots of initialization data
-            return "initialize_pool"
-        elif 24 < data_len <= 48:
-            return "update_params"
+        if data_len <= 48:
+            name = SHAPE_NAMES[data_len][min(acc_count, 6)]
         else:
-            return f"unknown_{data_len}b_{acc_count}acc"
+            name = _shape_name(data_len, acc_count)
+        return name or _unknown_name(data_len, acc_count)
 
     def is_likely_swap(self, data, accounts):
         """Check if instruction is likely a swap"""
         # Swaps typically have 6+ accounts and 16-24 bytes of data
         return len(accounts) >= 6 and 16 <= len(data) <= 32
 
-    def extract_swap_data(self, ix, message, sig_info, tx, data, accounts):
+    def extract_swap_data(self, ix, message, sig_info, tx, data, accounts, account_keys):
         """Extract swap details"""
         try:
             # Parse amount from data (usually after discriminator)
             if len(data) >= 16:
-                amount = struct.unpack('<Q', data[8:16])[0]  # Little-endian u64
+                amount = _U64.unpack_from(data, 8)[0]
 
                 swap = SwapData(
                     tx_id=str(sig_info.signature),
                     slot=sig_info.slot,
-                    timestamp=datetime.fromtimestamp(sig_info.block_time) if sig_info.block_time else datetime.now(),
-                    pool_address=accounts[0]['pubkey'] if accounts else "",
+                    timestamp=_ts_to_dt(sig_info.block_time) if sig_info.block_time else datetime.now(),
+                    pool_address=self.keys[self.intern_key(account_keys[accounts[0]])] if accounts else "",
                     token_in="",  # Would need to identify from accounts
                     token_out="",
                     amount_in=amount,
@@ -439,20 +544,16 @@ class TransactionAnalyzer:
         print("\n[*] Instruction Analysis:")
         print(f"  Found {len(self.instruction_map)} unique instructions")
 
-        # Sort by frequency
-        sorted_instructions = sorted(
-            self.instruction_map.items(),
-            key=lambda x: x[1].frequency,
-            reverse=True
-        )
+        # Top by frequency
+        top_instructions = heapq.nlargest(10, self.instruction_map.items(), key=lambda x: x[1].frequency)
 
         print("\n  Top Instructions by Frequency:")
         print("  " + "-" * 80)
         print(f"  {'Discriminator':<20} {'Name':<25} {'Frequency':<10} {'Accounts':<10} {'Data Size':<10}")
         print("  " + "-" * 80)
 
-        for disc, info in sorted_instructions[:10]:
-            print(f"  {disc[:16]+'...':<20} {info.name:<25} {info.frequency:<10} {info.account_count:<10} {info.data_size:<10}")
+        for disc, info in top_instructions:
+            print(f"  {disc.hex()+'...':<20} {info.name:<25} {info.frequency:<10} {info.account_count:<10} {info.data_size:<10}")
 
         return self.instruction_map
 
@@ -545,7 +646,7 @@ class StateAnalyzer:
                 elif field.type == "u64":
                     value = struct.unpack('<Q', raw_bytes)[0]
                 elif field.type == "pubkey":
-                    value = base58.b58encode(raw_bytes).decode()
+                    value = b58.b58encode(raw_bytes).decode()
                 else:
                     value = raw_bytes.hex()
 
@@ -576,19 +677,31 @@ class AlgorithmDeriver:
             print("  No swap data available")
             return
 
-        # Group swaps by size ranges
-        df = pd.DataFrame([asdict(s) for s in self.swap_data])
+        # Columns needed for the statistics, built once
+        count = len(self.swap_data)
+        amounts = np.fromiter((s.amount_in for s in self.swap_data), dtype=np.float64, count=count)
+        slippage = np.fromiter(
+            (np.nan if s.slippage_bps is None else s.slippage_bps for s in self.swap_data),
+            dtype=np.float64, count=count
+        )
 
-        if df.empty:
+        # Group swaps into quintiles by size; buckets are right-inclusive like pd.qcut
+        edges = np.quantile(amounts, [0.2, 0.4, 0.6, 0.8])
+        if np.unique(edges).size < edges.size:
+            print("  Not enough distinct trade sizes for quintile buckets")
             return
+        buckets = np.searchsorted(edges, amounts, side='left')
 
-        # Analyze slippage vs trade size
-        if 'amount_in' in df.columns and 'realized_price' in df.columns:
-            df['trade_size_category'] = pd.qcut(df['amount_in'], q=5, labels=['XS', 'S', 'M', 'L', 'XL'])
+        # Mean slippage per bucket, ignoring swaps without a slippage estimate
+        known = ~np.isnan(slippage)
+        sums = np.bincount(buckets[known], weights=slippage[known], minlength=5)
+        counts = np.bincount(buckets[known], minlength=5)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(counts > 0, sums / counts, np.nan)
 
-            slippage_by_size = df.groupby('trade_size_category')['slippage_bps'].mean()
-            print("  Average slippage by trade size:")
-            print(slippage_by_size)
+        print("  Average slippage by trade size:")
+        for label, mean in zip(['XS', 'S', 'M', 'L', 'XL'], means):
+            print(f"    {label:<3} {mean:.2f}")
 
     def estimate_concentration_factor(self):
         """Estimate concentration factor (c) from slippage patterns"""
@@ -644,150 +757,164 @@ class ReportGenerator:
     def generate_architecture_doc(self, tx_analyzer, state_analyzer):
         """Generate D1: Architecture documentation"""
         with open(self.output_dir / "D1_ARCHITECTURE_README.md", "w") as f:
-            f.write("# Lifinity V2 Architecture Overview\n\n")
-            f.write(f"**Program ID**: `{LIFINITY_V2_PROGRAM_ID}`\n\n")
-
-            f.write("## System Components\n\n")
-            f.write("### Core Program\n")
-            f.write("- **Type**: Solana BPF Program\n")
-            f.write("- **Binary Size**: ~1.1 MB\n")
-            f.write("- **Deployment**: Mainnet-beta\n\n")
-
-            f.write("### Key Accounts\n")
-            f.write("1. **Pool State PDAs**: Hold pool configuration and reserves\n")
-            f.write("2. **Token Vaults**: SPL token accounts for each asset\n")
-            f.write("3. **Oracle Accounts**: Pyth price feeds\n")
-            f.write("4. **Authority**: Pool admin/upgrade authority\n\n")
-
-            f.write("### Control Flow\n")
-            f.write("```\n")
-            f.write("1. Initialize Pool\n")
-            f.write("   ├── Create PDA\n")
-            f.write("   ├── Initialize vaults\n")
-            f.write("   └── Set parameters (c, z, θ)\n\n")
-            f.write("2. Swap\n")
-            f.write("   ├── Read oracle price\n")
-            f.write("   ├── Check freshness/confidence\n")
-            f.write("   ├── Calculate output (oracle-anchored curve)\n")
-            f.write("   ├── Apply inventory adjustment\n")
-            f.write("   ├── Deduct fees\n")
-            f.write("   └── Transfer tokens\n\n")
-            f.write("3. Rebalance (v2)\n")
-            f.write("   ├── Check |p/p* - 1| ≥ θ\n")
-            f.write("   ├── Update virtual reserves\n")
-            f.write("   └── Set p* = p\n")
-            f.write("```\n\n")
-
-            f.write("### Invariants\n")
-            f.write("- Oracle price anchoring maintained\n")
-            f.write("- Fee collection monotonically increasing\n")
-            f.write("- Rebalance cooldown enforced\n")
+            f.writelines((
+                "# Lifinity V2 Architecture Overview\n\n",
+                f"**Program ID**: `{LIFINITY_V2_PROGRAM_ID}`\n\n",
+
+                "## System Components\n\n",
+                "### Core Program\n",
+                "- **Type**: Solana BPF Program\n",
+                "- **Binary Size**: ~1.1 MB\n",
+                "- **Deployment**: Mainnet-beta\n\n",
+
+                "### Key Accounts\n",
+                "1. **Pool State PDAs**: Hold pool configuration and reserves\n",
+                "2. **Token Vaults**: SPL token accounts for each asset\n",
+                "3. **Oracle Accounts**: Pyth price feeds\n",
+                "4. **Authority**: Pool admin/upgrade authority\n\n",
+
+                "### Control Flow\n",
+                "```\n",
+                "1. Initialize Pool\n",
+                "   ├── Create PDA\n",
+                "   ├── Initialize vaults\n",
+                "   └── Set parameters (c, z, θ)\n\n",
+                "2. Swap\n",
+                "   ├── Read oracle price\n",
+                "   ├── Check freshness/confidence\n",
+                "   ├── Calculate output (oracle-anchored curve)\n",
+                "   ├── Apply inventory adjustment\n",
+                "   ├── Deduct fees\n",
+                "   └── Transfer tokens\n\n",
+                "3. Rebalance (v2)\n",
+                "   ├── Check |p/p* - 1| ≥ θ\n",
+                "   ├── Update virtual reserves\n",
+                "   └── Set p* = p\n",
+                "```\n\n",
+
+                "### Invariants\n",
+                "- Oracle price anchoring maintained\n",
+                "- Fee collection monotonically increasing\n",
+                "- Rebalance cooldown enforced\n",
+            ))
 
     def generate_instruction_catalog(self, tx_analyzer):
         """Generate D2: Instruction catalog"""
         with open(self.output_dir / "D2_INSTRUCTION_CATALOG.md", "w") as f:
-            f.write("# Lifinity V2 Instruction Catalog\n\n")
-
-            f.write("| Discriminator | Name | Accounts | Data Size | Frequency | Admin |\n")
-            f.write("|--------------|------|----------|-----------|-----------|-------|\n")
-
-            for disc, info in sorted(tx_analyzer.instruction_map.items(),
-                                    key=lambda x: x[1].frequency, reverse=True):
-                is_admin = "✓" if info.is_admin else ""
-                f.write(f"| `{disc[:16]}...` | {info.name} | {info.account_count} | ")
-                f.write(f"{info.data_size} | {info.frequency} | {is_admin} |\n")
-
-            f.write("\n## Account Patterns\n\n")
+            f.writelines((
+                "# Lifinity V2 Instruction Catalog\n\n",
+
+                "| Discriminator | Name | Accounts | Data Size | Frequency | Admin |\n",
+                "|--------------|------|----------|-----------|-----------|-------|\n",
+            ))
+
+            rows = [
+                f"| `{disc.hex()}...` | {info.name} | {info.account_count} | "
+                f"{info.data_size} | {info.frequency} | {'✓' if info.is_admin else ''} |\n"
+                for disc, info in sorted(tx_analyzer.instruction_map.items(),
+                                         key=lambda x: x[1].frequency, reverse=True)
+            ]
+            rows.append("\n## Account Patterns\n\n")
             for disc, info in list(tx_analyzer.instruction_map.items())[:3]:
                 if info.typical_accounts:
-                    f.write(f"### {info.name}\n")
-                    f.write("```\n")
-                    for i, acc in enumerate(info.typical_accounts[0][:6]):
-                        f.write(f"{i}: {acc['pubkey'][:8]}... ")
-                        f.write(f"[{'S' if acc['is_signer'] else ' '}{'W' if acc['is_writable'] else 'R'}]\n")
-                    f.write("```\n\n")
+                    rows.append(f"### {info.name}\n```\n")
+                    rows.extend(
+                        f"{i}: {tx_analyzer.keys[acc['key']][:8]}... "
+                        f"[{'S' if acc['is_signer'] else ' '}{'W' if acc['is_writable'] else 'R'}]\n"
+                        for i, acc in enumerate(info.typical_accounts[0][:6])
+                    )
+                    rows.append("```\n\n")
+            f.writelines(rows)
 
     def generate_state_layouts(self, state_analyzer):
         """Generate D3: State layouts documentation"""
         with open(self.output_dir / "D3_STATE_LAYOUTS.md", "w") as f:
-            f.write("# Lifinity V2 State Layouts\n\n")
-
-            f.write("## Pool State Layout\n\n")
-            f.write("| Offset | Size | Field | Type | Description |\n")
-            f.write("|--------|------|-------|------|-------------|\n")
-
-            for field in state_analyzer.state_layout:
-                f.write(f"| {field.offset} | {field.size} | {field.name} | ")
-                f.write(f"{field.type} | {field.description} |\n")
+            f.writelines((
+                "# Lifinity V2 State Layouts\n\n",
+
+                "## Pool State Layout\n\n",
+                "| Offset | Size | Field | Type | Description |\n",
+                "|--------|------|-------|------|-------------|\n",
+            ))
+
+            f.writelines(
+                f"| {field.offset} | {field.size} | {field.name} | "
+                f"{field.type} | {field.description} |\n"
+                for field in state_analyzer.state_layout
+            )
 
-            f.write("\n**Total Size**: ~304 bytes\n\n")
+            f.writelines((
+                "\n**Total Size**: ~304 bytes\n\n",
 
-            f.write("## Key Parameters\n\n")
-            f.write("- **Concentration Factor (c)**: Controls liquidity concentration\n")
-            f.write("- **Inventory Exponent (z)**: Asymmetric liquidity adjustment\n")
-            f.write("- **Rebalance Threshold (θ)**: Trigger for v2 rebalancing\n")
-            f.write("- **Last Rebalance Price (p*)**: Reference price for rebalancing\n")
+                "## Key Parameters\n\n",
+                "- **Concentration Factor (c)**: Controls liquidity concentration\n",
+                "- **Inventory Exponent (z)**: Asymmetric liquidity adjustment\n",
+                "- **Rebalance Threshold (θ)**: Trigger for v2 rebalancing\n",
+                "- **Last Rebalance Price (p*)**: Reference price for rebalancing\n",
+            ))
 
     def generate_algorithms_spec(self, algorithm_deriver):
         """Generate D4: Algorithms specification"""
         with open(self.output_dir / "D4_ALGORITHMS_SPEC.md", "w") as f:
-            f.write("# Lifinity V2 Algorithm Specifications\n\n")
-
-            f.write("## Oracle-Anchored Pricing\n\n")
-            f.write("```python\n")
-            f.write("def get_swap_price(oracle_price, direction):\n")
-            f.write("    # Mid price anchored to oracle\n")
-            f.write("    mid_price = oracle_price\n")
-            f.write("    \n")
-            f.write("    # Apply spread based on direction\n")
-            f.write("    if direction == 'buy':\n")
-            f.write("        price = mid_price * (1 + spread/2)\n")
-            f.write("    else:\n")
-            f.write("        price = mid_price * (1 - spread/2)\n")
-            f.write("    \n")
-            f.write("    return price\n")
-            f.write("```\n\n")
-
-            f.write("## Concentrated Liquidity\n\n")
-            f.write("```python\n")
-            f.write("def calculate_output(amount_in, reserves_x, reserves_y, c):\n")
-            f.write("    # Concentrated constant product\n")
-            f.write("    K_effective = c * reserves_x * reserves_y\n")
-            f.write("    \n")
-            f.write("    # Standard AMM formula with concentrated K\n")
-            f.write("    amount_out = (amount_in * reserves_y) / (reserves_x + amount_in)\n")
-            f.write("    \n")
-            f.write("    return amount_out\n")
-            f.write("```\n\n")
-
-            f.write("## Inventory-Aware Adjustment\n\n")
-            f.write("```python\n")
-            f.write("def apply_inventory_adjustment(K_base, value_x, value_y, z, direction):\n")
-            f.write("    ratio = value_x / value_y\n")
-            f.write("    \n")
-            f.write("    if direction == 'buy_x' and value_x < value_y:\n")
-            f.write("        # X is scarce, reduce liquidity for buying X\n")
-            f.write("        K_adjusted = K_base * (value_y/value_x) ** z\n")
-            f.write("    elif direction == 'sell_x' and value_x < value_y:\n")
-            f.write("        # X is scarce, increase liquidity for selling X\n")
-            f.write("        K_adjusted = K_base * (value_x/value_y) ** z\n")
-            f.write("    # ... other cases\n")
-            f.write("    \n")
-            f.write("    return K_adjusted\n")
-            f.write("```\n\n")
-
-            f.write("## V2 Threshold Rebalancing\n\n")
-            f.write("```python\n")
-            f.write("def check_rebalance(current_price, last_rebalance_price, threshold):\n")
-            f.write("    deviation = abs(current_price / last_rebalance_price - 1)\n")
-            f.write("    \n")
-            f.write("    if deviation >= threshold:\n")
-            f.write("        # Trigger rebalance\n")
-            f.write("        recenter_liquidity()\n")
-            f.write("        last_rebalance_price = current_price\n")
-            f.write("    \n")
-            f.write("    return last_rebalance_price\n")
-            f.write("```\n")
+            f.writelines((
+                "# Lifinity V2 Algorithm Specifications\n\n",
+
+                "## Oracle-Anchored Pricing\n\n",
+                "```python\n",
+                "def get_swap_price(oracle_price, direction):\n",
+                "    # Mid price anchored to oracle\n",
+                "    mid_price = oracle_price\n",
+                "    \n",
+                "    # Apply spread based on direction\n",
+                "    if direction == 'buy':\n",
+                "        price = mid_price * (1 + spread/2)\n",
+                "    else:\n",
+                "        price = mid_price * (1 - spread/2)\n",
+                "    \n",
+                "    return price\n",
+                "```\n\n",
+
+                "## Concentrated Liquidity\n\n",
+                "```python\n",
+                "def calculate_output(amount_in, reserves_x, reserves_y, c):\n",
+                "    # Concentrated constant product\n",
+                "    K_effective = c * reserves_x * reserves_y\n",
+                "    \n",
+                "    # Standard AMM formula with concentrated K\n",
+                "    amount_out = (amount_in * reserves_y) / (reserves_x + amount_in)\n",
+                "    \n",
+                "    return amount_out\n",
+                "```\n\n",
+
+                "## Inventory-Aware Adjustment\n\n",
+                "```python\n",
+                "def apply_inventory_adjustment(K_base, value_x, value_y, z, direction):\n",
+                "    ratio = value_x / value_y\n",
+                "    \n",
+                "    if direction == 'buy_x' and value_x < value_y:\n",
+                "        # X is scarce, reduce liquidity for buying X\n",
+                "        K_adjusted = K_base * (value_y/value_x) ** z\n",
+                "    elif direction == 'sell_x' and value_x < value_y:\n",
+                "        # X is scarce, increase liquidity for selling X\n",
+                "        K_adjusted = K_base * (value_x/value_y) ** z\n",
+                "    # ... other cases\n",
+                "    \n",
+                "    return K_adjusted\n",
+                "```\n\n",
+
+                "## V2 Threshold Rebalancing\n\n",
+                "```python\n",
+                "def check_rebalance(current_price, last_rebalance_price, threshold):\n",
+                "    deviation = abs(current_price / last_rebalance_price - 1)\n",
+                "    \n",
+                "    if deviation >= threshold:\n",
+                "        # Trigger rebalance\n",
+                "        recenter_liquidity()\n",
+                "        last_rebalance_price = current_price\n",
+                "    \n",
+                "    return last_rebalance_price\n",
+                "```\n",
+            ))
 
     def generate_mermaid_diagrams(self):
         """Generate D10: Mermaid diagrams"""
@@ -795,102 +922,110 @@ class ReportGenerator:
 
         # System Context Diagram
         with open(self.output_dir / "diagrams" / "system_context.mmd", "w") as f:
-            f.write("graph TB\n")
-            f.write("    User[User/Aggregator]\n")
-            f.write("    Program[Lifinity V2 Program]\n")
-            f.write("    Oracle[Pyth Oracle]\n")
-            f.write("    Vaults[Token Vaults]\n")
-            f.write("    Admin[Admin/Authority]\n")
-            f.write("    \n")
-            f.write("    User -->|Swap| Program\n")
-            f.write("    Program -->|Read Price| Oracle\n")
-            f.write("    Program <-->|Transfer| Vaults\n")
-            f.write("    Admin -->|Update Params| Program\n")
+            f.writelines((
+                "graph TB\n",
+                "    User[User/Aggregator]\n",
+                "    Program[Lifinity V2 Program]\n",
+                "    Oracle[Pyth Oracle]\n",
+                "    Vaults[Token Vaults]\n",
+                "    Admin[Admin/Authority]\n",
+                "    \n",
+                "    User -->|Swap| Program\n",
+                "    Program -->|Read Price| Oracle\n",
+                "    Program <-->|Transfer| Vaults\n",
+                "    Admin -->|Update Params| Program\n",
+            ))
 
         # Swap Sequence Diagram
         with open(self.output_dir / "diagrams" / "swap_sequence.mmd", "w") as f:
-            f.write("sequenceDiagram\n")
-            f.write("    participant U as User\n")
-            f.write("    participant P as Program\n")
-            f.write("    participant O as Oracle\n")
-            f.write("    participant V as Vaults\n")
-            f.write("    \n")
-            f.write("    U->>P: SwapExactInput(amount)\n")
-            f.write("    P->>O: GetPrice()\n")
-            f.write("    O-->>P: price, confidence\n")
-            f.write("    P->>P: CheckFreshness()\n")
-            f.write("    P->>P: CalculateOutput()\n")
-            f.write("    P->>P: ApplyInventoryAdjustment()\n")
-            f.write("    P->>P: DeductFees()\n")
-            f.write("    P->>V: TransferTokens()\n")
-            f.write("    P-->>U: Success\n")
+            f.writelines((
+                "sequenceDiagram\n",
+                "    participant U as User\n",
+                "    participant P as Program\n",
+                "    participant O as Oracle\n",
+                "    participant V as Vaults\n",
+                "    \n",
+                "    U->>P: SwapExactInput(amount)\n",
+                "    P->>O: GetPrice()\n",
+                "    O-->>P: price, confidence\n",
+                "    P->>P: CheckFreshness()\n",
+                "    P->>P: CalculateOutput()\n",
+                "    P->>P: ApplyInventoryAdjustment()\n",
+                "    P->>P: DeductFees()\n",
+                "    P->>V: TransferTokens()\n",
+                "    P-->>U: Success\n",
+            ))
 
         # Rebalance FSM
         with open(self.output_dir / "diagrams" / "rebalance_fsm.mmd", "w") as f:
-            f.write("stateDiagram-v2\n")
-            f.write("    [*] --> Balanced\n")
-            f.write("    Balanced --> Monitoring: Price Move\n")
-            f.write("    Monitoring --> Triggered: |p/p* - 1| ≥ θ\n")
-            f.write("    Triggered --> Rebalancing: Execute\n")
-            f.write("    Rebalancing --> Cooldown: Success\n")
-            f.write("    Cooldown --> Balanced: Timer Expires\n")
-            f.write("    Monitoring --> Balanced: |p/p* - 1| < θ\n")
+            f.writelines((
+                "stateDiagram-v2\n",
+                "    [*] --> Balanced\n",
+                "    Balanced --> Monitoring: Price Move\n",
+                "    Monitoring --> Triggered: |p/p* - 1| ≥ θ\n",
+                "    Triggered --> Rebalancing: Execute\n",
+                "    Rebalancing --> Cooldown: Success\n",
+                "    Cooldown --> Balanced: Timer Expires\n",
+                "    Monitoring --> Balanced: |p/p* - 1| < θ\n",
+            ))
 
     def generate_evm_report(self):
         """Generate D11: EVM Porting Report"""
         with open(self.output_dir / "D11_EVM_PORTING_REPORT.md", "w") as f:
-            f.write("# EVM Porting Feasibility Report\n\n")
-
-            f.write("## Executive Summary\n\n")
-            f.write("Lifinity V2's oracle-anchored AMM with inventory management ")
-            f.write("is portable to EVM chains with the following considerations:\n\n")
-
-            f.write("### Key Components Required\n\n")
-            f.write("1. **PoolCore Contract**\n")
-            f.write("   - Oracle-anchored swap logic\n")
-            f.write("   - Concentrated liquidity (virtual reserves)\n")
-            f.write("   - Inventory adjustment calculations\n\n")
-
-            f.write("2. **OracleAdapter Contract**\n")
-            f.write("   - Chainlink/Pyth integration\n")
-            f.write("   - Freshness validation\n")
-            f.write("   - Confidence filtering\n\n")
-
-            f.write("3. **RebalanceKeeper**\n")
-            f.write("   - Threshold monitoring\n")
-            f.write("   - Automated rebalancing\n")
-            f.write("   - Cooldown management\n\n")
-
-            f.write("### Gas Estimates\n\n")
-            f.write("| Operation | BNB Chain | Base |\n")
-            f.write("|-----------|-----------|------|\n")
-            f.write("| Swap | 150-200k | 120-180k |\n")
-            f.write("| Rebalance | 80-100k | 70-90k |\n")
-            f.write("| Initialize | 300-400k | 280-350k |\n\n")
-
-            f.write("### Parameter Mapping\n\n")
-            f.write("| Solana | EVM | Notes |\n")
-            f.write("|--------|-----|-------|\n")
-            f.write("| c (u64) | uint256 | Scale by 10^18 for precision |\n")
-            f.write("| z (u64) | uint256 | Keep as basis points |\n")
-            f.write("| θ (u64) | uint256 | Keep as basis points |\n")
-            f.write("| Slots | Blocks | Adjust timing logic |\n\n")
-
-            f.write("### Critical Differences\n\n")
-            f.write("1. **Oracle Latency**: EVM pull vs Solana push model\n")
-            f.write("2. **Gas Costs**: Higher on EVM, affects rebalance frequency\n")
-            f.write("3. **MEV**: More prevalent on EVM, needs protection\n")
-            f.write("4. **Keeper Infrastructure**: Required for automated rebalancing\n\n")
-
-            f.write("### Recommendations\n\n")
-            f.write("1. **Start with Base**: Lower fees, good oracle coverage\n")
-            f.write("2. **Use Chainlink**: Most reliable EVM oracles\n")
-            f.write("3. **Implement MEV Protection**: Commit-reveal or similar\n")
-            f.write("4. **Optimize Gas**: Pack storage, use assembly for math\n")
-            f.write("5. **Parameter Defaults**:\n")
-            f.write("   - c = 10 (moderate concentration)\n")
-            f.write("   - z = 0.5 (gentle inventory adjustment)\n")
-            f.write("   - θ = 50 bps (0.5% rebalance threshold)\n")
+            f.writelines((
+                "# EVM Porting Feasibility Report\n\n",
+
+                "## Executive Summary\n\n",
+                "Lifinity V2's oracle-anchored AMM with inventory management ",
+                "is portable to EVM chains with the following considerations:\n\n",
+
+                "### Key Components Required\n\n",
+                "1. **PoolCore Contract**\n",
+                "   - Oracle-anchored swap logic\n",
+                "   - Concentrated liquidity (virtual reserves)\n",
+                "   - Inventory adjustment calculations\n\n",
+
+                "2. **OracleAdapter Contract**\n",
+                "   - Chainlink/Pyth integration\n",
+                "   - Freshness validation\n",
+                "   - Confidence filtering\n\n",
+
+                "3. **RebalanceKeeper**\n",
+                "   - Threshold monitoring\n",
+                "   - Automated rebalancing\n",
+                "   - Cooldown management\n\n",
+
+                "### Gas Estimates\n\n",
+                "| Operation | BNB Chain | Base |\n",
+                "|-----------|-----------|------|\n",
+                "| Swap | 150-200k | 120-180k |\n",
+                "| Rebalance | 80-100k | 70-90k |\n",
+                "| Initialize | 300-400k | 280-350k |\n\n",
+
+                "### Parameter Mapping\n\n",
+                "| Solana | EVM | Notes |\n",
+                "|--------|-----|-------|\n",
+                "| c (u64) | uint256 | Scale by 10^18 for precision |\n",
+                "| z (u64) | uint256 | Keep as basis points |\n",
+                "| θ (u64) | uint256 | Keep as basis points |\n",
+                "| Slots | Blocks | Adjust timing logic |\n\n",
+
+                "### Critical Differences\n\n",
+                "1. **Oracle Latency**: EVM pull vs Solana push model\n",
+                "2. **Gas Costs**: Higher on EVM, affects rebalance frequency\n",
+                "3. **MEV**: More prevalent on EVM, needs protection\n",
+                "4. **Keeper Infrastructure**: Required for automated rebalancing\n\n",
+
+                "### Recommendations\n\n",
+                "1. **Start with Base**: Lower fees, good oracle coverage\n",
+                "2. **Use Chainlink**: Most reliable EVM oracles\n",
+                "3. **Implement MEV Protection**: Commit-reveal or similar\n",
+                "4. **Optimize Gas**: Pack storage, use assembly for math\n",
+                "5. **Parameter Defaults**:\n",
+                "   - c = 10 (moderate concentration)\n",
+                "   - z = 0.5 (gentle inventory adjustment)\n",
+                "   - θ = 50 bps (0.5% rebalance threshold)\n",
+            ))
 
 
 async def main():
@@ -905,15 +1040,18 @@ async def main():
     binary_analyzer = BinaryAnalyzer("lifinity_v2.so")
     tx_analyzer = TransactionAnalyzer()
 
-    # Binary analysis
-    binary_analyzer.analyze_binary()
+    try:
+        # Binary analysis
+        binary_analyzer.analyze_binary()
 
-    # Transaction analysis
-    await tx_analyzer.analyze_recent_transactions(limit=500)
+        # Transaction analysis
+        await tx_analyzer.analyze_recent_transactions(limit=500)
 
-    # State analysis
-    state_analyzer = StateAnalyzer(tx_analyzer.client)
-    pools = await state_analyzer.find_pool_accounts()
+        # State analysis
+        state_analyzer = StateAnalyzer(tx_analyzer.client)
+        pools = await state_analyzer.find_pool_accounts()
+    finally:
+        tx_analyzer.close()
 
     # Algorithm derivation
     algorithm_deriver = AlgorithmDeriver(tx_analyzer.swap_data)
@@ -932,4 +1070,9 @@ async def main():
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop  # libuv event loop; absent on Windows, where the default loop is used
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
@@ -9,6 +9,11 @@ import json
 from collections import defaultdict, Counter
 from typing import Dict, List, Tuple, Optional
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
+
 class LifinityBytecodeAnalyzer:
     def __init__(self, disasm_path: str):
         self.disasm_path = disasm_path
@@ -309,15 +314,17 @@ class LifinityBytecodeAnalyzer:
         report, pseudocode = self.generate_report()
 
         # Save JSON report
-        with open('lifinity_bytecode_analysis.json', 'w') as f:
-            json.dump(report, f, indent=2)
+        if orjson is not None:
+            with open('lifinity_bytecode_analysis.json', 'wb') as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        else:
+            with open('lifinity_bytecode_analysis.json', 'w') as f:
+                json.dump(report, f, indent=2)
 
         # Save pseudocode
+        header = "// Lifinity V2 - Extracted Pseudocode\n// Generated from bytecode analysis\n\n"
         with open('lifinity_pseudocode.txt', 'w') as f:
-            f.write("// Lifinity V2 - Extracted Pseudocode\n")
-            f.write("// Generated from bytecode analysis\n\n")
-            for code in pseudocode:
-                f.write(code)
+            f.write(header + "".join(pseudocode))
 
         print("\nAnalysis complete! Results saved to:")
         print("  - lifinity_bytecode_analysis.json")
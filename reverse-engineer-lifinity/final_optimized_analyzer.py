@@ -5,28 +5,46 @@ Production-ready version with comprehensive analysis and reporting
 Target: Initial results within 30 seconds, expandable for deeper analysis
 """
 
+import argparse
 import asyncio
-import json
 import struct
 import base64
 import time
-import pickle
 import hashlib
-from typing import Dict, List, Tuple, Optional, Any, Set
-from dataclasses import dataclass, field, asdict
+import sqlite3
+import heapq
+import logging
+from typing import Dict, List, Tuple, Optional, Any, Callable
+from dataclasses import dataclass, field, fields
+from functools import lru_cache, partial
+from operator import attrgetter
 from datetime import datetime, timedelta
 from pathlib import Path
-from collections import defaultdict, Counter
+from collections import defaultdict, deque, Counter
 import os
 import sys
 
+import aiohttp
+import msgpack
+import numpy as np
+import orjson
+
 # Core imports
-from solana.rpc.api import Client
 from solders.pubkey import Pubkey
-import base58
+
+try:
+    import based58 as b58  # Rust base58 codec; same bytes-in/bytes-out API
+except ImportError:
+    import base58 as b58
+
+try:
+    import zstandard
+except ImportError:  # Cache values are stored as plain msgpack
+    zstandard = None
 
 # Constants
 LIFINITY_V2_PROGRAM_ID = "2wT8Yq49kHgDzXuPxZSaeLaH1qbmGXtEyPy64bL7aD3c"
+LIFINITY_PROGRAM_BYTES = bytes(Pubkey.from_string(LIFINITY_V2_PROGRAM_ID))
 RPC_ENDPOINTS = [
     "https://api.mainnet-beta.solana.com",
     "https://solana-mainnet.g.alchemy.com/v2/demo",
@@ -38,22 +56,73 @@ KNOWN_ORACLE_PATTERNS = [
     "J83w4HKfqxwcq3BEMMkPFSppX3gqekLyLJBexebFVkix",  # SOL/USD
     "Gnt27xtC473ZT2Mw5u8wZ68Z3gULkSTb5DuxJy7eJotD",  # USDC/USD
     "3vxLXJqLqF3JG5TCbYycbKWRBbCJQLxQmBGCkyqEEefL",  # USDT/USD
-    "E4v1BBgoso9s64TjV1viAycbvG2QBGJZPIDjRn9YPUn",  # mSOL/USD
+    "E4v1BBgoso9s64TQvmyownAVJbhbEPGyzA3qn4n46qj9",  # mSOL/USD
     "7yyaeuJ1GGtVBLT2z2xub5ZWYKaNhF28mj1RdV4VDFVk", # JitoSOL/USD
     "AFrYBhb5wKQtxRS9UA9YRS4V3dwFm7SqmS6DHKq6YVgo"  # bSOL/USD
 ]
+KNOWN_TOKEN_PROGRAMS = [
+    "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA",  # Token program
+    "11111111111111111111111111111111",                # System program
+]
+
+def _decode_keys(keys: List[str]) -> Dict[bytes, str]:
+    """Map raw 32-byte pubkeys to their base58 form; a malformed entry is a config error"""
+    decoded = {}
+    for key in keys:
+        try:
+            raw = b58.b58decode(key.encode())
+        except ValueError as e:
+            raise ValueError(f"invalid base58 pubkey {key!r}: {e}") from None
+        if len(raw) != 32:
+            raise ValueError(f"pubkey {key!r} decodes to {len(raw)} bytes, expected 32")
+        decoded[raw] = key
+    return decoded
+
+# Raw 32-byte keys, matched against parsed account keys without base58 encoding
+ORACLE_BY_KEY = _decode_keys(KNOWN_ORACLE_PATTERNS)
+TOKEN_PROGRAM_KEYS = frozenset(_decode_keys(KNOWN_TOKEN_PROGRAMS))
 
 # Performance Configuration
 MAX_INITIAL_TXS = 100
+MAX_SWAPS = MAX_INITIAL_TXS * 4  # Swap events retained; older ones are overwritten
+SIGNATURE_PAGE_LIMIT = 1000  # getSignaturesForAddress cap per call
 BATCH_SIZE = 5
 REQUEST_TIMEOUT = 10
-PARALLEL_REQUESTS = 2
+PARALLEL_REQUESTS = 2  # Default cap on concurrent RPC POSTs per endpoint
 CACHE_TTL = 3600
-
-@dataclass
+HOT_THRESHOLD = 8  # Hits before a discriminator gets a specialized handler
+PROGRESS_INTERVAL = 1.0  # Seconds between progress log lines
+PARSE_QUEUE_SIZE = 32  # Fetched batches buffered ahead of the parser
+
+# Connection pooling and retry policy
+POOL_CONNECTIONS = 32
+POOL_PER_HOST = 16
+KEEPALIVE_TIMEOUT = 30
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.1  # Seconds, doubled on every retry
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+BATCH_REJECT_STATUSES = frozenset({400, 413})  # Batch too large or batching unsupported
+BATCH_UNSUPPORTED_CODES = frozenset({-32600})  # JSON-RPC "Invalid Request": a batch body the server won't take
+LATENCY_EMA_ALPHA = 0.2  # Weight of the newest sample in per-endpoint latency
+ENDPOINT_MAX_STRIKES = 3  # Consecutive failures before an endpoint is benched
+HEALTH_WINDOW = 20  # Recent calls per endpoint considered for its error rate
+HEALTH_MAX_ERROR_RATE = 0.5  # Above this, an endpoint ranks behind all others
+JSON_HEADERS = {"Content-Type": "application/json"}  # Request bodies are pre-serialized with orjson
+TX_CONFIG = {"encoding": "base64", "maxSupportedTransactionVersion": 0}
+NORMALIZED_TX_CACHE = "getTransaction/lifinity"  # Cache namespace for _normalize_transaction output, keyed by signature
+
+logger = logging.getLogger(__name__)
+
+_U64 = struct.Struct('<Q')  # Swap amount field following the discriminator
+
+def _json_default(obj: Any) -> str:
+    """orjson fallback: hex for raw discriminators, str for everything else"""
+    return obj.hex() if isinstance(obj, bytes) else str(obj)
+
+@dataclass(slots=True)
 class InstructionData:
     """Comprehensive instruction data"""
-    discriminator: str
+    discriminator: bytes  # Raw 8 bytes; hex-encoded only when written out
     name: str
     frequency: int = 0
     account_count: int = 0
@@ -64,19 +133,91 @@ class InstructionData:
     oracle_interactions: int = 0
     token_interactions: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class SwapEvent:
     """Detailed swap event data"""
     tx_id: str
     slot: int
-    timestamp: datetime
+    timestamp: int  # Unix block time; converted to datetime only when exported
     amount_in: int = 0
     estimated_out: int = 0
     instruction_type: str = "unknown"
     oracle_account: str = ""
     fee_estimated: int = 0
 
-@dataclass
+SWAP_FIELDS = tuple(f.name for f in fields(SwapEvent))
+
+def _swap_record(swap: SwapEvent) -> Dict[str, Any]:
+    """Export view of a swap with its block time rendered as ISO 8601"""
+    record = {name: getattr(swap, name) for name in SWAP_FIELDS}
+    record["timestamp"] = _ts_to_dt(swap.timestamp).isoformat()
+    return record
+
+SWAP_DTYPE = np.dtype([('amount', '<u8'), ('fee', '<u8'), ('slot', '<u8'), ('ts', '<i8')])
+
+class SwapLog:
+    """Bounded swap store: numeric columns in a NumPy struct array, strings in parallel lists.
+
+    Once `capacity` swaps are held the oldest one is overwritten, while
+    `total`, `volume` and the nonzero-amount stats keep counting every swap
+    seen. `SwapEvent` objects are only built when a consumer iterates.
+    """
+    __slots__ = ('capacity', 'total', 'volume', 'nonzero', 'largest', 'smallest',
+                 '_cols', '_tx', '_kind', '_oracle')
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.total = 0
+        self.volume = 0
+        self.nonzero = 0  # Swaps with a nonzero input amount
+        self.largest = 0
+        self.smallest = 0
+        self._cols = np.zeros(capacity, dtype=SWAP_DTYPE)
+        self._tx: List[str] = [""] * capacity
+        self._kind: List[str] = [""] * capacity
+        self._oracle: List[str] = [""] * capacity
+
+    def append(self, tx_id: str, slot: int, timestamp: int, amount_in: int, fee: int,
+               instruction_type: str, oracle_account: str):
+        i = self.total % self.capacity
+        self._cols[i] = (amount_in, fee, slot, timestamp)
+        self._tx[i] = tx_id
+        self._kind[i] = instruction_type
+        self._oracle[i] = oracle_account
+        self.total += 1
+        if amount_in:
+            self.volume += amount_in
+            if not self.nonzero or amount_in > self.largest:
+                self.largest = amount_in
+            if not self.nonzero or amount_in < self.smallest:
+                self.smallest = amount_in
+            self.nonzero += 1
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def _order(self) -> range:
+        """Buffer positions from oldest to newest"""
+        if self.total <= self.capacity:
+            return range(self.total)
+        start = self.total % self.capacity
+        return range(start, start + self.capacity)
+
+    def head(self, n: int) -> List[SwapEvent]:
+        """The `n` oldest retained swaps"""
+        return [self._event(i % self.capacity) for i in self._order()[:n]]
+
+    def _event(self, i: int) -> SwapEvent:
+        amount, fee, slot, ts = self._cols[i].tolist()
+        return SwapEvent(tx_id=self._tx[i], slot=slot, timestamp=ts, amount_in=amount,
+                         instruction_type=self._kind[i], oracle_account=self._oracle[i],
+                         fee_estimated=fee)
+
+    def __iter__(self):
+        for i in self._order():
+            yield self._event(i % self.capacity)
+
+@dataclass(slots=True)
 class OracleInteraction:
     """Oracle usage data"""
     oracle_account: str
@@ -84,30 +225,172 @@ class OracleInteraction:
     last_seen: datetime = field(default_factory=datetime.now)
     associated_swaps: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResults:
     """Comprehensive analysis results"""
-    instructions: Dict[str, InstructionData]
-    swaps: List[SwapEvent]
+    instructions: Dict[bytes, InstructionData]
+    swaps: SwapLog
     oracles: Dict[str, OracleInteraction]
     state_patterns: Dict[str, Any]
     processing_time: float
     coverage_stats: Dict[str, int]
-    raw_discriminators: Set[str]
+    raw_discriminators: Tuple[bytes, ...]  # Distinct, sorted once at build time
     critical_findings: List[str]
 
+@lru_cache(maxsize=4096)
+def _ts_to_dt(ts: int) -> datetime:
+    """Block time to datetime; transactions in the same slot share a timestamp"""
+    return datetime.fromtimestamp(ts)
+
+def _fmt_hms(dt: datetime) -> str:
+    """HH:MM:SS rendering of a datetime"""
+    return dt.strftime("%H:%M:%S")
+
+def _read_shortvec(buf: bytes, pos: int) -> Tuple[int, int]:
+    """Decode a Solana compact-u16 length; returns (value, next position)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+def _parse_transaction(raw: bytes, program_key: bytes) -> Tuple[List[bytes], List[Tuple[bytes, bytes]]]:
+    """Split a wire-format transaction into its static account keys and the
+    (accounts, data) of every instruction invoking ``program_key``.
+
+    Other programs' instruction bodies are stepped over without slicing,
+    and instructions are not walked at all when the program is absent.
+    """
+    sig_count, pos = _read_shortvec(raw, 0)
+    pos += 64 * sig_count
+    if raw[pos] & 0x80:
+        pos += 1  # Versioned message prefix
+    pos += 3  # Message header
+
+    key_count, pos = _read_shortvec(raw, pos)
+    keys = [raw[start:start + 32] for start in range(pos, pos + 32 * key_count, 32)]
+    program_indices = {i for i, key in enumerate(keys) if key == program_key}
+    if not program_indices:
+        return keys, []
+    pos += 32 * key_count + 32  # Keys, then the recent blockhash
+
+    ix_count, pos = _read_shortvec(raw, pos)
+    matched = []
+    for _ in range(ix_count):
+        program_idx = raw[pos]
+        acc_len, pos = _read_shortvec(raw, pos + 1)
+        acc_start, pos = pos, pos + acc_len
+        data_len, pos = _read_shortvec(raw, pos)
+        if program_idx in program_indices:
+            matched.append((raw[acc_start:acc_start + acc_len], raw[pos:pos + data_len]))
+        pos += data_len
+    return keys, matched
+
+def _classify_shape(data_len: int, acc_count: int) -> Optional[Tuple[str, float]]:
+    """Name and confidence for an instruction shape; None when unrecognized"""
+    # High confidence patterns
+    if data_len == 8 and acc_count <= 2:
+        return "query_state", 0.9
+    elif data_len == 16 and acc_count >= 6 and acc_count <= 10:
+        return "swap_exact_input", 0.85
+    elif data_len == 24 and acc_count >= 6 and acc_count <= 10:
+        return "swap_exact_output", 0.85
+    elif data_len > 100 and acc_count >= 10:
+        return "initialize_pool", 0.9
+    elif 40 <= data_len <= 80 and acc_count >= 5:
+        return "update_pool_params", 0.8
+    elif data_len == 8 and acc_count >= 3:
+        return "admin_action", 0.7
+
+    # Medium confidence patterns
+    elif 16 <= data_len <= 32:
+        if acc_count >= 6:
+            return "complex_swap", 0.6
+        else:
+            return "token_operation", 0.5
+    elif 32 < data_len <= 64:
+        return "pool_management", 0.5
+    return None
+
+# Shape tables indexed [data_len][acc_count]; every rule threshold sits below
+# the clamps, so only data longer than 64 bytes needs the scalar rules
+CLASSIFY = [[_classify_shape(data_len, acc_count) for acc_count in range(17)] for data_len in range(65)]
+IS_SWAP = [[16 <= data_len <= 40 and 6 <= acc_count <= 15 for acc_count in range(17)] for data_len in range(65)]
+
+def _normalize_transaction(tx_data: Dict[str, Any]) -> Tuple[List[bytes], List[Tuple[bytes, bytes]]]:
+    """Reduce a base64 getTransaction result to (account keys, Lifinity (accounts, data) pairs).
+
+    This is what gets cached: a cache hit skips the base64 decode and wire
+    parse, and transactions without a Lifinity instruction shrink to ([], []).
+    """
+    raw = base64.b64decode(tx_data["transaction"][0])
+    keys, instructions = _parse_transaction(raw, LIFINITY_PROGRAM_BYTES)
+    if not instructions:
+        return [], []
+
+    # v0 transactions resolve extra keys through address lookup tables
+    loaded = (tx_data.get("meta") or {}).get("loadedAddresses")
+    if loaded:
+        keys += [b58.b58decode(key.encode()) for key in loaded.get("writable", []) + loaded.get("readonly", [])]
+    return keys, instructions
+
+_BATCH_REJECTED = object()  # Sentinel from _post_with_retry for a refused batch body
+
+def _batch_unsupported(payload: Any) -> bool:
+    """True for a single JSON-RPC error object saying the server refuses batch bodies"""
+    if not isinstance(payload, dict):
+        return False
+    error = payload.get("error")
+    return isinstance(error, dict) and error.get("code") in BATCH_UNSUPPORTED_CODES
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"  # Frame header; msgpack maps/arrays never start with it
+UNPACK_ERRORS = (zstandard.ZstdError,) if zstandard else ()
+_zstd_c = zstandard.ZstdCompressor(level=3) if zstandard else None
+_zstd_d = zstandard.ZstdDecompressor() if zstandard else None
+
+def _pack_value(data: Any) -> bytes:
+    """msgpack a cache value, zstd-compressed when zstandard is installed"""
+    blob = msgpack.packb(data, use_bin_type=True)
+    return _zstd_c.compress(blob) if _zstd_c else blob
+
+def _unpack_value(blob: bytes) -> Any:
+    """Inverse of _pack_value; compressed rows read as misses without zstandard"""
+    if _zstd_d and blob.startswith(ZSTD_MAGIC):
+        blob = _zstd_d.decompress(blob)
+    return msgpack.unpackb(blob, raw=False)
+
 class PerformanceCache:
-    """High-performance caching system"""
+    """High-performance caching system: session dict over a sqlite3 WAL store"""
 
     def __init__(self, cache_dir: str = ".lifinity_cache"):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         self.memory_cache = {}  # In-memory cache for session
 
-    def _cache_key(self, method: str, params: Any) -> str:
-        """Generate cache key"""
-        cache_input = f"{method}:{json.dumps(params, sort_keys=True, default=str)}"
-        return hashlib.md5(cache_input.encode()).hexdigest()[:16]
+        # One B-tree file instead of a pickle file per key
+        self.db = sqlite3.connect(self.cache_dir / "rpc_cache.db", isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS c (key BLOB PRIMARY KEY, ts INT, data BLOB)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS c_ts ON c (ts)")
+
+        # Evict expired rows once per run so the store stays bounded
+        try:
+            self.db.execute("DELETE FROM c WHERE ts <= ?", (int(time.time() - CACHE_TTL),))
+        except sqlite3.Error:
+            pass
+
+    def _cache_key(self, method: str, params: Any) -> bytes:
+        """Generate cache key; scalar params skip JSON canonicalization"""
+        if isinstance(params, (str, int)):
+            cache_input = f"{method}:{params}".encode()
+        else:
+            cache_input = orjson.dumps((method, params), default=str, option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(cache_input, digest_size=16).digest()
 
     def get(self, method: str, params: Any) -> Optional[Any]:
         """Get cached response with memory + disk"""
@@ -119,18 +402,17 @@ class PerformanceCache:
 
         # Check disk cache
         try:
-            cache_file = self.cache_dir / f"{key}.pkl"
-            if cache_file.exists():
-                with open(cache_file, 'rb') as f:
-                    cached_data = pickle.load(f)
-
-                if time.time() - cached_data['timestamp'] < CACHE_TTL:
-                    # Load into memory cache
-                    self.memory_cache[key] = cached_data['data']
-                    return cached_data['data']
-                else:
-                    cache_file.unlink()
-        except Exception:
+            row = self.db.execute(
+                "SELECT data FROM c WHERE key = ? AND ts > ?",
+                (key, int(time.time() - CACHE_TTL))
+            ).fetchone()
+            if row:
+                # Load into memory cache
+                data = _unpack_value(row[0])
+                self.memory_cache[key] = data
+                return data
+        except (sqlite3.Error, ValueError, msgpack.UnpackException, *UNPACK_ERRORS):
+            # Includes rows pickled by older versions, which fail as ExtraData
             pass
 
         return None
@@ -144,30 +426,86 @@ class PerformanceCache:
 
         # Store on disk
         try:
-            cache_file = self.cache_dir / f"{key}.pkl"
-            with open(cache_file, 'wb') as f:
-                pickle.dump({
-                    'timestamp': time.time(),
-                    'data': data
-                }, f)
-        except Exception:
+            self.db.execute(
+                "INSERT OR REPLACE INTO c (key, ts, data) VALUES (?, ?, ?)",
+                (key, int(time.time()), _pack_value(data))
+            )
+        except sqlite3.Error:
             pass
 
+    def get_many(self, method: str, params_list: List[Any]) -> List[Optional[Any]]:
+        """Batch get: one disk query covers every key the memory cache misses"""
+        keys = [self._cache_key(method, params) for params in params_list]
+        results = [self.memory_cache.get(key) for key in keys]
+        missing = {key for key, data in zip(keys, results) if data is None}
+        if not missing:
+            return results
+
+        try:
+            rows = self.db.execute(
+                f"SELECT key, data FROM c WHERE ts > ? AND key IN ({','.join('?' * len(missing))})",
+                (int(time.time() - CACHE_TTL), *missing)
+            ).fetchall()
+        except sqlite3.Error:
+            return results
+
+        for key, blob in rows:
+            try:
+                self.memory_cache[key] = _unpack_value(blob)
+            except (ValueError, msgpack.UnpackException, *UNPACK_ERRORS):
+                pass
+        return [self.memory_cache.get(key) for key in keys]
+
+    def set_many(self, method: str, items: List[Tuple[Any, Any]]):
+        """Batch set: all (params, data) pairs land in one transaction"""
+        now = int(time.time())
+        rows = []
+        for params, data in items:
+            key = self._cache_key(method, params)
+            self.memory_cache[key] = data
+            rows.append((key, now, _pack_value(data)))
+
+        try:
+            self.db.execute("BEGIN")
+            self.db.executemany("INSERT OR REPLACE INTO c (key, ts, data) VALUES (?, ?, ?)", rows)
+            self.db.execute("COMMIT")
+        except sqlite3.Error:
+            if self.db.in_transaction:
+                self.db.execute("ROLLBACK")
+
+    def close(self):
+        """Close the sqlite store"""
+        self.db.close()
+
 class FinalOptimizedAnalyzer:
     """Production-ready Lifinity analyzer"""
 
-    def __init__(self, rpc_url: str = None, enable_cache: bool = True):
+    def __init__(self, rpc_url: str = None, enable_cache: bool = True, hedge: bool = False,
+                 max_concurrency: int = PARALLEL_REQUESTS):
         self.rpc_url = rpc_url or RPC_ENDPOINTS[0]
-        self.client = Client(self.rpc_url)
+        self.hedge = hedge  # Race each batch against the two best endpoints
+        self._endpoints = [self.rpc_url] + [url for url in RPC_ENDPOINTS if url != self.rpc_url]
+        self._latency: Dict[str, float] = {}
+        self._strikes: Counter = Counter()
+        self._outcomes: Dict[str, deque] = defaultdict(lambda: deque(maxlen=HEALTH_WINDOW))  # True per success
+        self._http: Optional[aiohttp.ClientSession] = None
+        self.max_concurrency = max_concurrency
+        # In-flight POSTs per endpoint, so a hedged race never starves the primary
+        self._sems = {url: asyncio.Semaphore(max_concurrency) for url in self._endpoints}
         self.cache = PerformanceCache() if enable_cache else None
-        self.program_id = Pubkey.from_string(LIFINITY_V2_PROGRAM_ID)
 
         # Analysis state
-        self.instructions: Dict[str, InstructionData] = {}
-        self.swaps: List[SwapEvent] = []
+        self.instructions: Dict[bytes, InstructionData] = {}
+        self.swaps = SwapLog(MAX_SWAPS)
         self.oracles: Dict[str, OracleInteraction] = {}
-        self.raw_discriminators: Set[str] = set()
         self.critical_findings: List[str] = []
+        self._hot_handlers: Dict[bytes, Callable[..., bool]] = {}
+
+        # Hot-loop bookkeeping; InstructionData objects are built after processing
+        self._freq: Counter = Counter()
+        self._first_seen: Dict[bytes, Tuple[str, float, int, int, str]] = {}
+        self._oracle_hits: Counter = Counter()
+        self._token_hits: Counter = Counter()
 
         # Performance tracking
         self.start_time = time.time()
@@ -175,6 +513,7 @@ class FinalOptimizedAnalyzer:
         self.successful_txs = 0
         self.errors = 0
         self.error_details = []
+        self._last_progress = 0.0
 
     async def analyze_incremental(self, max_time: int = 30, focus_areas: List[str] = None) -> AnalysisResults:
         """
@@ -211,386 +550,570 @@ class FinalOptimizedAnalyzer:
         """Optimized signature collection with caching"""
         print("📡 Collecting transaction signatures...")
 
-        cache_key = f"recent_sigs_{MAX_INITIAL_TXS}"
-        if self.cache:
-            cached = self.cache.get("signatures", cache_key)
-            if cached:
-                print(f"🎯 Using cached signatures ({len(cached)} found)")
-                return cached
-
+        signatures: List[Any] = []
+        before = None
         try:
-            response = self.client.get_signatures_for_address(
-                self.program_id,
-                limit=MAX_INITIAL_TXS
-            )
-
-            if response and response.value:
-                signatures = response.value
-                if self.cache:
-                    self.cache.set("signatures", cache_key, signatures)
-                print(f"✅ Collected {len(signatures)} signatures")
-                return signatures
+            # Page backwards with before= cursors; each window needs the previous one's last signature
+            while len(signatures) < MAX_INITIAL_TXS:
+                limit = min(SIGNATURE_PAGE_LIMIT, MAX_INITIAL_TXS - len(signatures))
+                page = await self._signature_window(before, limit)
+                signatures.extend(page)
+                if len(page) < limit:
+                    break
+                before = page[-1]["signature"]
 
         except Exception as e:
             print(f"⚠️ Signature collection failed: {e}")
 
-        return []
+        if signatures:
+            print(f"✅ Collected {len(signatures)} signatures")
+        return signatures
 
-    async def _process_transactions_optimized(self, signatures: List[Any], max_time: int):
-        """Optimized transaction processing with smart batching"""
-        print(f"⚡ Processing transactions (max {max_time}s)...")
+    async def _signature_window(self, before: Optional[str], limit: int) -> List[Any]:
+        """One getSignaturesForAddress window, cached on its own cursor"""
+        config = {"limit": limit}
+        if before:
+            config["before"] = before
+        params = [LIFINITY_V2_PROGRAM_ID, config]
 
-        start_time = time.time()
-        total_sigs = len(signatures)
+        if self.cache:
+            cached = self.cache.get("getSignaturesForAddress", params)
+            if cached:
+                print(f"🎯 Using cached signatures ({len(cached)} found)")
+                return cached
 
-        for i in range(0, total_sigs, BATCH_SIZE):
-            # Time check
-            if time.time() - start_time > max_time:
-                print(f"⏱️ Time limit reached")
-                break
+        # Raw JSON-RPC over the shared aiohttp session; entries stay plain dicts,
+        # trimmed to the fields processing reads (memo/err/status are dropped)
+        page = [
+            {"signature": entry["signature"], "slot": entry.get("slot"), "blockTime": entry.get("blockTime")}
+            for entry in (await self._rpc_batch("getSignaturesForAddress", [params]))[0] or []
+        ]
+        if page and self.cache:
+            self.cache.set("getSignaturesForAddress", params, page)
+        return page
 
-            batch = signatures[i:i + BATCH_SIZE]
-            batch_success = await self._process_batch_smart(batch)
+    async def _process_transactions_optimized(self, signatures: List[Any], max_time: int):
+        """Optimized transaction processing as a two-stage pipeline.
 
-            # Update stats
-            self.processed_txs += len(batch)
-            self.successful_txs += batch_success
+        max_concurrency fetchers drain a bounded batch queue and hand
+        normalized transactions to a single parser through a second queue,
+        so fetch latency overlaps with parsing. The TaskGroup cancels every
+        stage if one of them fails.
+        """
+        print(f"⚡ Processing transactions (max {max_time}s)...")
 
-            # Progress reporting
-            progress = (self.processed_txs / total_sigs) * 100
-            success_rate = (self.successful_txs / max(1, self.processed_txs)) * 100
+        deadline = time.monotonic() + max_time
+        total_sigs = len(signatures)
+        batches: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrency * 2)
+        parsed: asyncio.Queue = asyncio.Queue(maxsize=PARSE_QUEUE_SIZE)
+
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self._parse_worker(parsed, total_sigs))
+            fetchers = [
+                tg.create_task(self._fetch_worker(batches, parsed, deadline))
+                for _ in range(self.max_concurrency)
+            ]
+
+            for i in range(0, total_sigs, BATCH_SIZE):
+                # Time check
+                if time.monotonic() > deadline:
+                    print(f"⏱️ Time limit reached")
+                    break
+                await batches.put(signatures[i:i + BATCH_SIZE])
+
+            for _ in fetchers:
+                await batches.put(None)
+            await asyncio.gather(*fetchers)
+            await parsed.put(None)
+
+    async def _fetch_worker(self, batches: asyncio.Queue, parsed: asyncio.Queue, deadline: float):
+        """Fetch queued batches until the None sentinel; batches past the deadline are dropped"""
+        while True:
+            batch = await batches.get()
+            if batch is None:
+                return
+            if time.monotonic() > deadline:
+                continue
 
-            print(f"📊 {self.processed_txs}/{total_sigs} ({progress:.1f}%) "
-                  f"Success: {success_rate:.1f}% "
-                  f"Instructions: {len(self.instructions)} "
-                  f"Swaps: {len(self.swaps)}")
+            try:
+                ready = await self._fetch_batch(batch)
+            except Exception as e:
+                self._record_error(e)
+                ready = []
+            await parsed.put((len(batch), ready))
 
             # Adaptive delay based on error rate
             if self.errors > self.processed_txs * 0.5:
                 await asyncio.sleep(0.5)
 
-    async def _process_batch_smart(self, signatures: List[Any]) -> int:
-        """Smart batch processing with error isolation"""
-        successful = 0
-
-        for sig_info in signatures:
-            try:
-                if await self._process_transaction_smart(sig_info):
-                    successful += 1
-            except Exception as e:
-                self.errors += 1
-                if len(self.error_details) < 5:
-                    self.error_details.append(str(e)[:100])
-
-        return successful
-
-    async def _process_transaction_smart(self, sig_info) -> bool:
-        """Smart transaction processing with multiple strategies"""
-        try:
-            sig_str = str(sig_info.signature)
+    async def _parse_worker(self, parsed: asyncio.Queue, total_sigs: int):
+        """Extract instructions from fetched batches until the None sentinel"""
+        while True:
+            item = await parsed.get()
+            if item is None:
+                return
+            batch_size, ready = item
 
-            # Check cache
-            tx_data = None
-            if self.cache:
-                tx_data = self.cache.get("transaction", sig_str)
+            for normalized, sig_info in ready:
+                try:
+                    if self._extract_data_comprehensive(normalized, sig_info):
+                        self.successful_txs += 1
+                except Exception as e:
+                    self._record_error(e)
 
-            if not tx_data:
-                tx_data = await self._fetch_transaction_multi_strategy(sig_info.signature)
-                if not tx_data:
-                    return False
+            # Update stats
+            self.processed_txs += batch_size
+
+            # Progress reporting, throttled to one line per PROGRESS_INTERVAL
+            now = time.monotonic()
+            if now - self._last_progress > PROGRESS_INTERVAL or self.processed_txs >= total_sigs:
+                self._last_progress = now
+                logger.info("📊 %d/%d (%.1f%%) Success: %.1f%% Instructions: %d Swaps: %d",
+                            self.processed_txs, total_sigs,
+                            self.processed_txs / total_sigs * 100,
+                            self.successful_txs / max(1, self.processed_txs) * 100,
+                            len(self._freq), self.swaps.total)
+
+    def _record_error(self, error: Exception):
+        """Count a processing failure, keeping the first few messages"""
+        self.errors += 1
+        if len(self.error_details) < 5:
+            self.error_details.append(str(error)[:100])
+
+    def _session(self) -> aiohttp.ClientSession:
+        """Shared HTTP session, created lazily inside the running event loop"""
+        if self._http is None or self._http.closed:
+            connector = aiohttp.TCPConnector(
+                limit=POOL_CONNECTIONS,
+                limit_per_host=POOL_PER_HOST,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=300
+            )
+            self._http = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+                headers={"Accept-Encoding": "gzip, deflate"}
+            )
+        return self._http
 
-                if self.cache:
-                    self.cache.set("transaction", sig_str, tx_data)
+    async def aclose(self):
+        """Release the HTTP session and the cache store"""
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        if self.cache:
+            self.cache.close()
 
-            # Process with comprehensive extraction
-            return self._extract_data_comprehensive(tx_data, sig_info)
+    async def _rpc_batch(self, method: str, params_list: List[list]) -> List[Optional[Any]]:
+        """Send one JSON-RPC batch POST, failing over across endpoints.
 
-        except Exception:
-            return False
-
-    async def _fetch_transaction_multi_strategy(self, signature) -> Optional[Any]:
-        """Multi-strategy transaction fetching"""
-        strategies = [
-            {"encoding": "json", "max_supported_transaction_version": 0},
-            {"encoding": "jsonParsed", "max_supported_transaction_version": 0},
+        Endpoints are tried fastest first by latency EMA. With ``hedge`` the
+        batch goes to the two best endpoints at once and the first complete
+        answer wins. Results are returned in request order; calls no
+        endpoint could answer come back as None.
+        """
+        body = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, params in enumerate(params_list)
         ]
+        endpoints = self._ranked_endpoints()
+
+        if self.hedge and len(endpoints) > 1:
+            results = await self._race(endpoints[:2], body)
+            if results is not None:
+                return results
+            endpoints = endpoints[2:]
+
+        for url in endpoints:
+            results = await self._fetch_from(url, body)
+            if results is not None:
+                return results
+
+        return [None] * len(params_list)
+
+    def _ranked_endpoints(self) -> List[str]:
+        """Healthy endpoints by latency EMA; untried ones follow in configured order"""
+        healthy = [url for url in self._endpoints if self._strikes[url] < ENDPOINT_MAX_STRIKES]
+        if not healthy:
+            self._strikes.clear()  # Everything is benched; give them all another chance
+            healthy = list(self._endpoints)
+        return sorted(healthy, key=lambda url: (
+            self._error_rate(url) > HEALTH_MAX_ERROR_RATE,
+            url not in self._latency,
+            self._latency.get(url, 0.0),
+        ))
+
+    def _error_rate(self, url: str) -> float:
+        """Failure share over the endpoint's last HEALTH_WINDOW calls"""
+        outcomes = self._outcomes.get(url)
+        if not outcomes:
+            return 0.0
+        return 1.0 - sum(outcomes) / len(outcomes)
+
+    async def _race(self, urls: List[str], body: List[dict]) -> Optional[List[Optional[Any]]]:
+        """Hedged request: first endpoint to answer wins, the rest are cancelled"""
+        pending = {asyncio.create_task(self._fetch_from(url, body)) for url in urls}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    results = task.result()
+                    if results is not None:
+                        return results
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _fetch_from(self, url: str, body: List[dict]) -> Optional[List[Optional[Any]]]:
+        """Run a batch against one endpoint, updating its latency EMA and health"""
+        started = time.monotonic()
+        payload = await self._post_with_retry(url, body)
+
+        # Endpoints that reject batching answer 400/413 or an "Invalid Request"
+        # error object; fall back to one request per call on the same endpoint.
+        # Any other error object (rate limit, auth) counts as one endpoint failure
+        if payload is _BATCH_REJECTED or _batch_unsupported(payload):
+            replies = await asyncio.gather(*(self._post_with_retry(url, call) for call in body))
+            payload = [reply for reply in replies if isinstance(reply, dict)]
+            if not any("result" in reply for reply in payload):
+                payload = None
+        elif not isinstance(payload, list):
+            payload = None
+
+        if payload is None:
+            self._strikes[url] += 1
+            self._outcomes[url].append(False)
+            return None
+
+        elapsed = time.monotonic() - started
+        previous = self._latency.get(url)
+        self._latency[url] = elapsed if previous is None else previous + LATENCY_EMA_ALPHA * (elapsed - previous)
+        self._strikes[url] = 0
+        self._outcomes[url].append(True)
+
+        results: List[Optional[Any]] = [None] * len(body)
+        for item in payload:
+            idx = item.get("id")
+            if isinstance(idx, int) and 0 <= idx < len(results):
+                results[idx] = item.get("result")
+        return results
 
-        for strategy in strategies:
+    async def _post_with_retry(self, url: str, body: Any) -> Optional[Any]:
+        """POST a JSON-RPC body to one endpoint, retrying transient failures"""
+        delay = RETRY_BACKOFF
+        for attempt in range(RETRY_ATTEMPTS):
             try:
-                response = self.client.get_transaction(signature, **strategy)
-                if response and response.value:
-                    return response.value
-            except:
-                continue
+                async with self._sems[url], self._session().post(url, data=orjson.dumps(body), headers=JSON_HEADERS) as response:
+                    if response.status in BATCH_REJECT_STATUSES and isinstance(body, list):
+                        return _BATCH_REJECTED
+                    if response.status not in RETRY_STATUSES:
+                        if response.status >= 400:
+                            return None  # 401/403 and other refusals are not worth retrying
+                        return await response.json(loads=orjson.loads, content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+            except orjson.JSONDecodeError:
+                return None
+
+            if attempt + 1 < RETRY_ATTEMPTS:
+                await asyncio.sleep(delay)
+                delay *= 2
 
         return None
 
-    def _extract_data_comprehensive(self, tx_data, sig_info) -> bool:
-        """Comprehensive data extraction from transactions"""
-        try:
-            found_lifinity = False
-
-            # Multiple parsing strategies
-            message = None
-            if hasattr(tx_data, 'transaction'):
-                if hasattr(tx_data.transaction, 'transaction'):
-                    message = tx_data.transaction.transaction.message
-                else:
-                    message = tx_data.transaction.message
-
-            if message and hasattr(message, 'instructions'):
-                for ix in message.instructions:
-                    if self._is_lifinity_instruction(ix, message):
-                        self._process_lifinity_instruction_comprehensive(ix, message, sig_info)
-                        found_lifinity = True
-
-            return found_lifinity
+    async def _fetch_batch(self, signatures: List[Any]) -> List[Tuple[Tuple[List[bytes], List[Tuple[bytes, bytes]]], Any]]:
+        """Fetch a batch of transactions in one round-trip; returns (normalized, sig_info) pairs"""
+        ready: List[Tuple[Tuple[List[bytes], List[Tuple[bytes, bytes]]], Any]] = []
+        pending: List[Tuple[Any, str]] = []
+
+        # Normalized entries are keyed on the bare signature; TX_CONFIG is fixed per namespace
+        sigs = [sig_info["signature"] for sig_info in signatures]
+        cached = self.cache.get_many(NORMALIZED_TX_CACHE, sigs) if self.cache else [None] * len(signatures)
+        for sig_info, sig_str, normalized in zip(signatures, sigs, cached):
+            if normalized:
+                ready.append((normalized, sig_info))
+            else:
+                pending.append((sig_info, sig_str))
 
-        except Exception:
+        if pending:
+            fetched = await self._rpc_batch("getTransaction", [[sig_str, TX_CONFIG] for _, sig_str in pending])
+            to_cache = []
+            for (sig_info, sig_str), tx_data in zip(pending, fetched):
+                if not tx_data:
+                    continue
+                try:
+                    normalized = _normalize_transaction(tx_data)
+                except (KeyError, TypeError, IndexError, ValueError):
+                    continue
+                to_cache.append((sig_str, normalized))
+                ready.append((normalized, sig_info))
+            if self.cache and to_cache:
+                self.cache.set_many(NORMALIZED_TX_CACHE, to_cache)
+
+        return ready
+
+    def _extract_data_comprehensive(self, normalized: Tuple[List[bytes], List[Tuple[bytes, bytes]]], sig_info) -> bool:
+        """Comprehensive data extraction from a normalized transaction"""
+        keys, instructions = normalized
+        if not instructions:
             return False
 
-    def _is_lifinity_instruction(self, ix, message) -> bool:
-        """Check if instruction belongs to Lifinity program"""
-        try:
-            program_idx = ix.program_id_index
-            if program_idx < len(message.account_keys):
-                program_key = str(message.account_keys[program_idx])
-                return program_key == LIFINITY_V2_PROGRAM_ID
-        except:
-            pass
-        return False
+        for accounts, data in instructions:
+            self._process_lifinity_instruction_comprehensive(data, accounts, keys, sig_info)
 
-    def _process_lifinity_instruction_comprehensive(self, ix, message, sig_info):
-        """Comprehensive Lifinity instruction processing"""
-        try:
-            # Extract instruction data
-            data = self._extract_instruction_data(ix)
-            if not data or len(data) < 8:
-                return
+        return True
 
-            discriminator = data[:8].hex()
-            self.raw_discriminators.add(discriminator)
+    def _process_lifinity_instruction_comprehensive(self, data: bytes, accounts: bytes, account_keys: List[bytes], sig_info):
+        """Comprehensive Lifinity instruction processing; accounts are key indices, one per byte"""
+        if len(data) < 8:
+            return
 
-            # Get accounts
-            accounts = getattr(ix, 'accounts', [])
+        discriminator = data[:8]
 
-            # Comprehensive instruction analysis
-            self._analyze_instruction_comprehensive(discriminator, data, accounts, message, sig_info)
+        # Hot discriminators skip classification and swap detection
+        handler = self._hot_handlers.get(discriminator)
+        if handler is not None and handler(data, accounts, account_keys, sig_info):
+            return
 
-            # Detect specific patterns
-            self._detect_swap_patterns(discriminator, data, accounts, message, sig_info)
-            self._detect_oracle_patterns(accounts, message)
+        # Comprehensive instruction analysis
+        self._analyze_instruction_comprehensive(discriminator, data, accounts, account_keys, sig_info)
 
-        except Exception:
-            pass
+        # Detect specific patterns
+        self._detect_swap_patterns(discriminator, data, accounts, account_keys, sig_info)
+        self._detect_oracle_patterns(accounts, account_keys)
 
-    def _extract_instruction_data(self, ix) -> Optional[bytes]:
-        """Extract instruction data from various formats"""
-        try:
-            if hasattr(ix, 'data'):
-                if isinstance(ix.data, str):
-                    return base58.b58decode(ix.data)
-                elif isinstance(ix.data, bytes):
-                    return ix.data
-                else:
-                    return bytes(ix.data)
-        except:
-            pass
-        return None
+        # Bind once: a handler that declines a shape falls through here without being rebuilt
+        if handler is None and self._freq[discriminator] >= HOT_THRESHOLD:
+            self._hot_handlers[discriminator] = self._bind_specialized(discriminator, data, accounts)
 
-    def _analyze_instruction_comprehensive(self, discriminator: str, data: bytes, accounts: List, message, sig_info):
+    def _analyze_instruction_comprehensive(self, discriminator: bytes, data: bytes, accounts: List, account_keys: List[bytes], sig_info):
         """Comprehensive instruction analysis"""
-        if discriminator not in self.instructions:
+        # Update statistics; a zero count means the discriminator is new
+        if not self._freq[discriminator]:
             name, confidence = self._classify_instruction_advanced(data, accounts)
-
-            self.instructions[discriminator] = InstructionData(
-                discriminator=discriminator,
-                name=name,
-                frequency=0,
-                account_count=len(accounts),
-                data_size=len(data),
-                sample_data=data[:32].hex(),
-                confidence=confidence,
-                oracle_interactions=0,
-                token_interactions=0
-            )
-
-        # Update statistics
-        inst = self.instructions[discriminator]
-        inst.frequency += 1
+            self._first_seen[discriminator] = (name, confidence, len(accounts), len(data), data[:32].hex())
+        self._freq[discriminator] += 1
 
         # Analyze account interactions
-        oracle_count, token_count = self._analyze_account_patterns(accounts, message)
-        inst.oracle_interactions += oracle_count
-        inst.token_interactions += token_count
+        oracle_count, token_count = self._analyze_account_patterns(accounts, account_keys)
+        if oracle_count:
+            self._oracle_hits[discriminator] += oracle_count
+        if token_count:
+            self._token_hits[discriminator] += token_count
 
     def _classify_instruction_advanced(self, data: bytes, accounts: List) -> Tuple[str, float]:
         """Advanced instruction classification with confidence scores"""
         data_len = len(data)
         acc_count = len(accounts)
-
-        # High confidence patterns
-        if data_len == 8 and acc_count <= 2:
-            return "query_state", 0.9
-        elif data_len == 16 and acc_count >= 6 and acc_count <= 10:
-            return "swap_exact_input", 0.85
-        elif data_len == 24 and acc_count >= 6 and acc_count <= 10:
-            return "swap_exact_output", 0.85
-        elif data_len > 100 and acc_count >= 10:
-            return "initialize_pool", 0.9
-        elif 40 <= data_len <= 80 and acc_count >= 5:
-            return "update_pool_params", 0.8
-        elif data_len == 8 and acc_count >= 3:
-            return "admin_action", 0.7
-
-        # Medium confidence patterns
-        elif 16 <= data_len <= 32:
-            if acc_count >= 6:
-                return "complex_swap", 0.6
-            else:
-                return "token_operation", 0.5
-        elif 32 < data_len <= 64:
-            return "pool_management", 0.5
+        if data_len <= 64:
+            shape = CLASSIFY[data_len][min(acc_count, 16)]
+        else:
+            shape = _classify_shape(data_len, acc_count)
 
         # Low confidence
-        return f"unknown_{data_len}b_{acc_count}acc", 0.1
+        return shape or (f"unknown_{data_len}b_{acc_count}acc", 0.1)
 
-    def _detect_swap_patterns(self, discriminator: str, data: bytes, accounts: List, message, sig_info):
+    def _detect_swap_patterns(self, discriminator: bytes, data: bytes, accounts: List, account_keys: List[bytes], sig_info):
         """Detect and analyze swap patterns"""
         if not self._is_likely_swap(data, accounts):
             return
 
-        try:
-            # Extract swap amount
-            amount_in = 0
-            if len(data) >= 16:
-                amount_in = struct.unpack('<Q', data[8:16])[0]
-
-            # Find oracle account in this transaction
-            oracle_account = self._find_oracle_in_accounts(accounts, message)
-
-            swap = SwapEvent(
-                tx_id=str(sig_info.signature),
-                slot=sig_info.slot or 0,
-                timestamp=datetime.fromtimestamp(sig_info.block_time) if sig_info.block_time else datetime.now(),
-                amount_in=amount_in,
-                instruction_type=self.instructions.get(discriminator, InstructionData("", "")).name,
-                oracle_account=oracle_account,
-                fee_estimated=self._estimate_fee(amount_in)
-            )
+        # Extract swap amount
+        amount_in = 0
+        if len(data) >= 16:
+            amount_in = _U64.unpack_from(data, 8)[0]
+
+        # Find oracle account in this transaction
+        oracle_account = self._find_oracle_in_accounts(accounts, account_keys)
+
+        instruction_type = self._first_seen[discriminator][0]
+        self._record_swap(instruction_type, amount_in, oracle_account, sig_info)
+
+    def _record_swap(self, instruction_type: str, amount_in: int, oracle_account: str, sig_info):
+        """Append a swap event and credit its oracle"""
+        self.swaps.append(
+            sig_info["signature"],
+            sig_info.get("slot") or 0,
+            sig_info.get("blockTime") or int(time.time()),
+            amount_in,
+            self._estimate_fee(amount_in),
+            instruction_type,
+            oracle_account
+        )
 
-            self.swaps.append(swap)
+        # Update oracle interaction count
+        if oracle_account and oracle_account in self.oracles:
+            self.oracles[oracle_account].associated_swaps += 1
 
-            # Update oracle interaction count
-            if oracle_account and oracle_account in self.oracles:
-                self.oracles[oracle_account].associated_swaps += 1
+    def _bind_specialized(self, discriminator: bytes, data: bytes, accounts: List) -> Callable[..., bool]:
+        """Bind a hot discriminator to a handler specialized on its observed shape"""
+        handler = self._fast_swap if self._is_likely_swap(data, accounts) else self._fast_passive
+        return partial(handler, discriminator, self._first_seen[discriminator][0], len(data), len(accounts))
 
-        except Exception:
-            pass
+    def _fast_swap(self, discriminator: bytes, name: str, data_size: int, account_count: int,
+                   data: bytes, accounts: List, account_keys: List[bytes], sig_info) -> bool:
+        """Hot path for a known swap discriminator; False deopts to the generic path"""
+        if len(data) != data_size or len(accounts) != account_count:
+            return False
+
+        oracle_keys = self._scan_accounts_hot(discriminator, accounts, account_keys)
+        amount_in = _U64.unpack_from(data, 8)[0]
+        self._record_swap(name, amount_in, oracle_keys[0] if oracle_keys else "", sig_info)
+        self._track_oracles(oracle_keys)
+        return True
+
+    def _fast_passive(self, discriminator: bytes, name: str, data_size: int, account_count: int,
+                      data: bytes, accounts: List, account_keys: List[bytes], sig_info) -> bool:
+        """Hot path for a known non-swap discriminator; False deopts to the generic path"""
+        if len(data) != data_size or len(accounts) != account_count:
+            return False
+
+        self._track_oracles(self._scan_accounts_hot(discriminator, accounts, account_keys))
+        return True
+
+    def _scan_accounts_hot(self, discriminator: bytes, accounts: List, account_keys: List[bytes]) -> List[str]:
+        """Single account pass updating instruction stats; returns oracle keys in order"""
+        self._freq[discriminator] += 1
+        oracle_keys = []
+        token_count = 0
+        key_count = len(account_keys)
+
+        for acc_idx in accounts:
+            if acc_idx < key_count:
+                acc_key = account_keys[acc_idx]
+                oracle = ORACLE_BY_KEY.get(acc_key)
+                if oracle:
+                    oracle_keys.append(oracle)
+                elif acc_key in TOKEN_PROGRAM_KEYS:
+                    token_count += 1
+
+        if oracle_keys:
+            self._oracle_hits[discriminator] += len(oracle_keys)
+        if token_count:
+            self._token_hits[discriminator] += token_count
+        return oracle_keys
 
     def _is_likely_swap(self, data: bytes, accounts: List) -> bool:
         """Enhanced swap detection"""
-        return (16 <= len(data) <= 40 and
-                6 <= len(accounts) <= 15)
+        return IS_SWAP[min(len(data), 64)][min(len(accounts), 16)]
 
-    def _find_oracle_in_accounts(self, accounts: List, message) -> str:
+    def _find_oracle_in_accounts(self, accounts: List, account_keys: List[bytes]) -> str:
         """Find oracle account in transaction accounts"""
-        try:
-            for acc_idx in accounts:
-                if acc_idx < len(message.account_keys):
-                    acc_key = str(message.account_keys[acc_idx])
-                    if self._is_known_oracle(acc_key):
-                        return acc_key
-        except:
-            pass
+        for acc_idx in accounts:
+            if acc_idx < len(account_keys):
+                oracle = ORACLE_BY_KEY.get(account_keys[acc_idx])
+                if oracle:
+                    return oracle
         return ""
 
-    def _is_known_oracle(self, account_key: str) -> bool:
+    def _is_known_oracle(self, account_key: bytes) -> bool:
         """Check if account is a known oracle"""
-        return account_key in KNOWN_ORACLE_PATTERNS
+        return account_key in ORACLE_BY_KEY
 
     def _estimate_fee(self, amount: int) -> int:
         """Estimate fee based on amount (typical AMM fee 0.3%)"""
         return int(amount * 0.003) if amount > 0 else 0
 
-    def _detect_oracle_patterns(self, accounts: List, message):
+    def _detect_oracle_patterns(self, accounts: List, account_keys: List[bytes]):
         """Detect and track oracle usage patterns"""
-        try:
-            for acc_idx in accounts:
-                if acc_idx < len(message.account_keys):
-                    acc_key = str(message.account_keys[acc_idx])
-
-                    if self._is_known_oracle(acc_key):
-                        if acc_key not in self.oracles:
-                            self.oracles[acc_key] = OracleInteraction(
-                                oracle_account=acc_key,
-                                usage_count=0,
-                                last_seen=datetime.now(),
-                                associated_swaps=0
-                            )
-
-                        self.oracles[acc_key].usage_count += 1
-                        self.oracles[acc_key].last_seen = datetime.now()
-
-        except Exception:
-            pass
-
-    def _analyze_account_patterns(self, accounts: List, message) -> Tuple[int, int]:
+        self._track_oracles([
+            ORACLE_BY_KEY[account_keys[acc_idx]] for acc_idx in accounts
+            if acc_idx < len(account_keys) and self._is_known_oracle(account_keys[acc_idx])
+        ])
+
+    def _track_oracles(self, oracle_keys: List[str]):
+        """Record usage of known oracle accounts"""
+        for acc_key in oracle_keys:
+            if acc_key not in self.oracles:
+                self.oracles[acc_key] = OracleInteraction(
+                    oracle_account=acc_key,
+                    usage_count=0,
+                    last_seen=datetime.now(),
+                    associated_swaps=0
+                )
+
+            self.oracles[acc_key].usage_count += 1
+            self.oracles[acc_key].last_seen = datetime.now()
+
+    def _analyze_account_patterns(self, accounts: List, account_keys: List[bytes]) -> Tuple[int, int]:
         """Analyze account patterns to identify oracle and token interactions"""
         oracle_count = 0
         token_count = 0
 
-        try:
-            for acc_idx in accounts:
-                if acc_idx < len(message.account_keys):
-                    acc_key = str(message.account_keys[acc_idx])
+        for acc_idx in accounts:
+            if acc_idx < len(account_keys):
+                acc_key = account_keys[acc_idx]
 
-                    if self._is_known_oracle(acc_key):
-                        oracle_count += 1
-                    elif self._is_likely_token_account(acc_key):
-                        token_count += 1
-
-        except Exception:
-            pass
+                if self._is_known_oracle(acc_key):
+                    oracle_count += 1
+                elif self._is_likely_token_account(acc_key):
+                    token_count += 1
 
         return oracle_count, token_count
 
-    def _is_likely_token_account(self, account_key: str) -> bool:
+    def _is_likely_token_account(self, account_key: bytes) -> bool:
         """Check if account is likely a token account"""
         # SPL token accounts typically have certain patterns
-        known_token_programs = [
-            "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA",  # Token program
-            "11111111111111111111111111111111",                # System program
-        ]
-        return account_key in known_token_programs
+        return account_key in TOKEN_PROGRAM_KEYS
 
     async def _analyze_patterns_comprehensive(self, focus_areas: List[str] = None):
         """Comprehensive pattern analysis"""
         print("🔍 Analyzing patterns comprehensively...")
+        self._materialize_instructions()
+
+        # Mark critical instructions, evaluated over the frequency/confidence columns
+        freqs, confidences = self._instruction_arrays()
+        total_instructions = int(freqs.sum())
+        if total_instructions > 0:
+            critical = (freqs / total_instructions > 0.1) | (freqs > 10) | (confidences > 0.8)
+            for inst, is_critical in zip(self.instructions.values(), critical.tolist()):
+                inst.is_critical = is_critical
+
+    def _materialize_instructions(self):
+        """Build or refresh InstructionData records from the hot-loop counters"""
+        for discriminator, frequency in self._freq.items():
+            inst = self.instructions.get(discriminator)
+            if inst is not None:
+                # Counters keep growing across runs; refresh in place so flags like is_critical survive
+                inst.frequency = frequency
+                inst.oracle_interactions = self._oracle_hits[discriminator]
+                inst.token_interactions = self._token_hits[discriminator]
+                continue
+            name, confidence, account_count, data_size, sample_data = self._first_seen[discriminator]
+            self.instructions[discriminator] = InstructionData(
+                discriminator=discriminator,
+                name=name,
+                frequency=frequency,
+                account_count=account_count,
+                data_size=data_size,
+                sample_data=sample_data,
+                confidence=confidence,
+                oracle_interactions=self._oracle_hits[discriminator],
+                token_interactions=self._token_hits[discriminator]
+            )
 
-        # Mark critical instructions
-        total_instructions = sum(inst.frequency for inst in self.instructions.values())
-        for inst in self.instructions.values():
-            if total_instructions > 0:
-                frequency_ratio = inst.frequency / total_instructions
-                inst.is_critical = (frequency_ratio > 0.1 or
-                                  inst.frequency > 10 or
-                                  inst.confidence > 0.8)
+    def _instruction_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Frequency and confidence columns for all instructions"""
+        count = len(self.instructions)
+        values = self.instructions.values()
+        freqs = np.fromiter((inst.frequency for inst in values), dtype=np.int64, count=count)
+        confidences = np.fromiter((inst.confidence for inst in values), dtype=np.float64, count=count)
+        return freqs, confidences
 
     def _generate_critical_findings(self):
         """Generate critical findings and insights"""
         self.critical_findings = []
+        freqs, _ = self._instruction_arrays()
 
         # High frequency instructions
-        high_freq_instructions = [inst for inst in self.instructions.values() if inst.frequency > 5]
-        if high_freq_instructions:
-            self.critical_findings.append(f"Found {len(high_freq_instructions)} high-frequency instructions")
+        high_freq_count = int((freqs > 5).sum())
+        if high_freq_count:
+            self.critical_findings.append(f"Found {high_freq_count} high-frequency instructions")
 
         # Swap activity
-        if len(self.swaps) > 0:
-            total_volume = sum(swap.amount_in for swap in self.swaps)
-            avg_volume = total_volume / len(self.swaps)
-            self.critical_findings.append(f"Detected {len(self.swaps)} swaps with avg volume: {avg_volume:,.0f}")
+        if self.swaps.total > 0:
+            avg_volume = self.swaps.volume / self.swaps.total
+            self.critical_findings.append(f"Detected {self.swaps.total} swaps with avg volume: {avg_volume:,.0f}")
 
         # Oracle usage
         if len(self.oracles) > 0:
@@ -598,24 +1121,26 @@ class FinalOptimizedAnalyzer:
             self.critical_findings.append(f"Active oracles: {len(active_oracles)}/{len(self.oracles)}")
 
         # Instruction diversity
-        if len(self.raw_discriminators) > 5:
-            self.critical_findings.append(f"High instruction diversity: {len(self.raw_discriminators)} unique discriminators")
+        if len(self._freq) > 5:
+            self.critical_findings.append(f"High instruction diversity: {len(self._freq)} unique discriminators")
 
     def _create_results(self, status: str) -> AnalysisResults:
         """Create comprehensive analysis results"""
         processing_time = time.time() - self.start_time
+        self._materialize_instructions()
+        freqs, confidences = self._instruction_arrays()
 
         # Generate state patterns
         state_patterns = {
             "total_unique_instructions": len(self.instructions),
-            "total_instruction_calls": sum(inst.frequency for inst in self.instructions.values()),
-            "high_confidence_instructions": len([i for i in self.instructions.values() if i.confidence > 0.8]),
+            "total_instruction_calls": int(freqs.sum()),
+            "high_confidence_instructions": int((confidences > 0.8).sum()),
             "swap_instructions": len([i for i in self.instructions.values() if "swap" in i.name]),
             "admin_instructions": len([i for i in self.instructions.values() if "admin" in i.name]),
             "oracle_accounts_detected": len(self.oracles),
-            "total_swaps_detected": len(self.swaps),
-            "total_swap_volume": sum(swap.amount_in for swap in self.swaps),
-            "raw_discriminators_found": len(self.raw_discriminators),
+            "total_swaps_detected": self.swaps.total,
+            "total_swap_volume": self.swaps.volume,
+            "raw_discriminators_found": len(self._freq),
             "error_rate_percent": round((self.errors / max(1, self.processed_txs)) * 100, 2),
             "success_rate_percent": round((self.successful_txs / max(1, self.processed_txs)) * 100, 2)
         }
@@ -626,9 +1151,9 @@ class FinalOptimizedAnalyzer:
             "errors": self.errors,
             "error_rate_percent": state_patterns["error_rate_percent"],
             "instructions_found": len(self.instructions),
-            "swaps_found": len(self.swaps),
+            "swaps_found": self.swaps.total,
             "oracles_found": len(self.oracles),
-            "raw_discriminators": len(self.raw_discriminators),
+            "raw_discriminators": len(self._freq),
             "processing_time_seconds": round(processing_time, 2),
             "status": status,
             "critical_findings_count": len(self.critical_findings)
@@ -641,7 +1166,7 @@ class FinalOptimizedAnalyzer:
             state_patterns=state_patterns,
             processing_time=processing_time,
             coverage_stats=coverage_stats,
-            raw_discriminators=self.raw_discriminators,
+            raw_discriminators=tuple(sorted(self._freq)),
             critical_findings=self.critical_findings
         )
 
@@ -657,103 +1182,159 @@ class ComprehensiveReporter:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         report_file = self.output_dir / f"lifinity_comprehensive_{timestamp}.md"
 
-        with open(report_file, 'w') as f:
-            self._write_executive_summary(f, results)
-            self._write_instruction_analysis(f, results)
-            self._write_swap_analysis(f, results)
-            self._write_oracle_analysis(f, results)
-            self._write_technical_details(f, results)
-            self._write_critical_findings(f, results)
+        sections = [
+            self._write_executive_summary(results),
+            self._write_instruction_analysis(results),
+            self._write_swap_analysis(results),
+            self._write_oracle_analysis(results),
+            self._write_technical_details(results),
+            self._write_critical_findings(results),
+        ]
+        report_file.write_text("".join(sections), encoding="utf-8")
 
         print(f"📊 Comprehensive report: {report_file.name}")
         return str(report_file)
 
-    def _write_executive_summary(self, f, results: AnalysisResults):
-        """Write executive summary section"""
-        f.write("# Lifinity V2 Comprehensive Analysis Report\n\n")
-        f.write(f"**Analysis Time**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"**Processing Duration**: {results.processing_time:.2f}s\n")
-        f.write(f"**Status**: {results.coverage_stats['status']}\n\n")
-
-        f.write("## Executive Summary\n\n")
-        f.write(f"- **Transactions Analyzed**: {results.coverage_stats['processed_transactions']}\n")
-        f.write(f"- **Success Rate**: {results.state_patterns['success_rate_percent']:.1f}%\n")
-        f.write(f"- **Unique Instructions**: {len(results.instructions)}\n")
-        f.write(f"- **Swap Activity**: {len(results.swaps)} swaps detected\n")
-        f.write(f"- **Oracle Integrations**: {len(results.oracles)} oracles\n")
-        f.write(f"- **Critical Findings**: {len(results.critical_findings)}\n\n")
-
-    def _write_instruction_analysis(self, f, results: AnalysisResults):
-        """Write instruction analysis section"""
-        f.write("## Instruction Analysis\n\n")
+    def export_json(self, results: AnalysisResults) -> Path:
+        """Stream the results to JSON one record at a time.
+
+        Each dataclass is converted and written immediately, so the export
+        never holds a second full copy of the results in memory.
+        """
+        json_file = self.output_dir / f"lifinity_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        metadata = {
+            "analysis_time": datetime.now().isoformat(),
+            "processing_time": results.processing_time,
+            "coverage_stats": results.coverage_stats
+        }
+
+        with open(json_file, 'wb') as f:
+            f.write(b'{\n"metadata": ')
+            f.write(orjson.dumps(metadata, default=_json_default))
+            self._stream_mapping(f, "instructions", results.instructions)
+            self._stream_sequence(f, "swaps", map(_swap_record, results.swaps))
+            self._stream_mapping(f, "oracles", results.oracles)
+            f.write(b',\n"state_patterns": ')
+            f.write(orjson.dumps(results.state_patterns, default=_json_default))
+            self._stream_sequence(f, "raw_discriminators", iter(results.raw_discriminators))
+            self._stream_sequence(f, "critical_findings", iter(results.critical_findings))
+            f.write(b'\n}\n')
+
+        return json_file
+
+    @staticmethod
+    def _stream_mapping(f, name: str, records: Dict[str, Any]):
+        """Write a mapping of dataclass records as a JSON object member"""
+        f.write(f',\n"{name}": {{'.encode())
+        for i, (key, record) in enumerate(records.items()):
+            f.write(b',\n  ' if i else b'\n  ')
+            f.write(orjson.dumps(key, default=_json_default))
+            f.write(b': ')
+            f.write(orjson.dumps(record, default=_json_default))  # Dataclasses serialize natively
+        f.write(b'\n}' if records else b'}')
+
+    @staticmethod
+    def _stream_sequence(f, name: str, items):
+        """Write an iterable as a JSON array member"""
+        f.write(f',\n"{name}": ['.encode())
+        wrote = False
+        for item in items:
+            f.write(b',\n  ' if wrote else b'\n  ')
+            f.write(orjson.dumps(item, default=_json_default))
+            wrote = True
+        f.write(b'\n]' if wrote else b']')
+
+    def _write_executive_summary(self, results: AnalysisResults) -> str:
+        """Build executive summary section"""
+        buf: List[str] = []
+        buf.append("# Lifinity V2 Comprehensive Analysis Report\n\n")
+        buf.append(f"**Analysis Time**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        buf.append(f"**Processing Duration**: {results.processing_time:.2f}s\n")
+        buf.append(f"**Status**: {results.coverage_stats['status']}\n\n")
+
+        buf.append("## Executive Summary\n\n")
+        buf.append(f"- **Transactions Analyzed**: {results.coverage_stats['processed_transactions']}\n")
+        buf.append(f"- **Success Rate**: {results.state_patterns['success_rate_percent']:.1f}%\n")
+        buf.append(f"- **Unique Instructions**: {len(results.instructions)}\n")
+        buf.append(f"- **Swap Activity**: {results.swaps.total} swaps detected\n")
+        buf.append(f"- **Oracle Integrations**: {len(results.oracles)} oracles\n")
+        buf.append(f"- **Critical Findings**: {len(results.critical_findings)}\n\n")
+
+        return "".join(buf)
+
+    def _write_instruction_analysis(self, results: AnalysisResults) -> str:
+        """Build instruction analysis section"""
+        buf: List[str] = []
+        buf.append("## Instruction Analysis\n\n")
 
         # Summary table
-        f.write("### Instruction Summary\n\n")
-        f.write("| Discriminator | Name | Frequency | Confidence | Critical | Oracle Interactions |\n")
-        f.write("|---------------|------|-----------|------------|----------|--------------------|\n")
+        buf.append("### Instruction Summary\n\n")
+        buf.append("| Discriminator | Name | Frequency | Confidence | Critical | Oracle Interactions |\n")
+        buf.append("|---------------|------|-----------|------------|----------|--------------------|\n")
 
-        sorted_instructions = sorted(
-            results.instructions.values(),
-            key=lambda x: x.frequency,
-            reverse=True
-        )
+        top_instructions = heapq.nlargest(15, results.instructions.values(), key=attrgetter('frequency'))
 
-        for inst in sorted_instructions[:15]:
+        for inst in top_instructions:
             critical = "✅" if inst.is_critical else ""
-            f.write(f"| `{inst.discriminator[:16]}...` | {inst.name} | {inst.frequency} | ")
-            f.write(f"{inst.confidence:.2f} | {critical} | {inst.oracle_interactions} |\n")
+            buf.append(f"| `{inst.discriminator.hex()}...` | {inst.name} | {inst.frequency} | ")
+            buf.append(f"{inst.confidence:.2f} | {critical} | {inst.oracle_interactions} |\n")
 
         # High-confidence instructions
         high_conf = [i for i in results.instructions.values() if i.confidence > 0.8]
         if high_conf:
-            f.write(f"\n### High-Confidence Instructions ({len(high_conf)} found)\n\n")
+            buf.append(f"\n### High-Confidence Instructions ({len(high_conf)} found)\n\n")
             for inst in sorted(high_conf, key=lambda x: x.frequency, reverse=True):
-                f.write(f"- **{inst.name}** (`{inst.discriminator[:16]}...`): {inst.frequency} calls\n")
-                f.write(f"  - Confidence: {inst.confidence:.2f}\n")
-                f.write(f"  - Data size: {inst.data_size} bytes\n")
-                f.write(f"  - Accounts: {inst.account_count}\n\n")
+                buf.append(f"- **{inst.name}** (`{inst.discriminator.hex()}...`): {inst.frequency} calls\n")
+                buf.append(f"  - Confidence: {inst.confidence:.2f}\n")
+                buf.append(f"  - Data size: {inst.data_size} bytes\n")
+                buf.append(f"  - Accounts: {inst.account_count}\n\n")
+
+        return "".join(buf)
 
-    def _write_swap_analysis(self, f, results: AnalysisResults):
-        """Write swap analysis section"""
-        f.write("## Swap Activity Analysis\n\n")
+    def _write_swap_analysis(self, results: AnalysisResults) -> str:
+        """Build swap analysis section"""
+        buf: List[str] = []
+        buf.append("## Swap Activity Analysis\n\n")
 
         if not results.swaps:
-            f.write("No swap activity detected in analyzed transactions.\n\n")
-            return
+            buf.append("No swap activity detected in analyzed transactions.\n\n")
+            return "".join(buf)
 
-        f.write(f"**Total Swaps Detected**: {len(results.swaps)}\n")
-        f.write(f"**Total Volume**: {results.state_patterns['total_swap_volume']:,} units\n")
+        buf.append(f"**Total Swaps Detected**: {results.swaps.total}\n")
+        buf.append(f"**Total Volume**: {results.state_patterns['total_swap_volume']:,} units\n")
 
-        if len(results.swaps) > 0:
-            amounts = [s.amount_in for s in results.swaps if s.amount_in > 0]
-            if amounts:
-                f.write(f"**Average Swap Size**: {sum(amounts) // len(amounts):,} units\n")
-                f.write(f"**Largest Swap**: {max(amounts):,} units\n")
-                f.write(f"**Smallest Swap**: {min(amounts):,} units\n\n")
+        swaps = results.swaps
+        if swaps.nonzero:
+            buf.append(f"**Average Swap Size**: {swaps.volume // swaps.nonzero:,} units\n")
+            buf.append(f"**Largest Swap**: {swaps.largest:,} units\n")
+            buf.append(f"**Smallest Swap**: {swaps.smallest:,} units\n\n")
 
         # Recent swaps
-        f.write("### Recent Swap Transactions\n\n")
-        f.write("| Transaction | Amount | Oracle Used | Estimated Fee | Type |\n")
-        f.write("|-------------|--------|-------------|---------------|------|\n")
+        buf.append("### Recent Swap Transactions\n\n")
+        buf.append("| Transaction | Amount | Oracle Used | Estimated Fee | Type |\n")
+        buf.append("|-------------|--------|-------------|---------------|------|\n")
 
-        for swap in results.swaps[:10]:
+        for swap in results.swaps.head(10):
             oracle_short = swap.oracle_account[:8] + "..." if swap.oracle_account else "None"
-            f.write(f"| `{swap.tx_id[:16]}...` | {swap.amount_in:,} | {oracle_short} | ")
-            f.write(f"{swap.fee_estimated:,} | {swap.instruction_type} |\n")
+            buf.append(f"| `{swap.tx_id[:16]}...` | {swap.amount_in:,} | {oracle_short} | ")
+            buf.append(f"{swap.fee_estimated:,} | {swap.instruction_type} |\n")
+
+        return "".join(buf)
 
-    def _write_oracle_analysis(self, f, results: AnalysisResults):
-        """Write oracle analysis section"""
-        f.write("\n## Oracle Integration Analysis\n\n")
+    def _write_oracle_analysis(self, results: AnalysisResults) -> str:
+        """Build oracle analysis section"""
+        buf: List[str] = []
+        buf.append("\n## Oracle Integration Analysis\n\n")
 
         if not results.oracles:
-            f.write("No oracle interactions detected in analyzed transactions.\n\n")
-            return
+            buf.append("No oracle interactions detected in analyzed transactions.\n\n")
+            return "".join(buf)
 
-        f.write(f"**Total Oracle Accounts**: {len(results.oracles)}\n\n")
+        buf.append(f"**Total Oracle Accounts**: {len(results.oracles)}\n\n")
 
-        f.write("### Oracle Usage Summary\n\n")
-        f.write("| Oracle Account | Usage Count | Associated Swaps | Last Seen |\n")
-        f.write("|----------------|-------------|------------------|----------|\n")
+        buf.append("### Oracle Usage Summary\n\n")
+        buf.append("| Oracle Account | Usage Count | Associated Swaps | Last Seen |\n")
+        buf.append("|----------------|-------------|------------------|----------|\n")
 
         sorted_oracles = sorted(
             results.oracles.values(),
@@ -763,46 +1344,59 @@ class ComprehensiveReporter:
 
         for oracle in sorted_oracles:
             oracle_short = oracle.oracle_account[:12] + "..." + oracle.oracle_account[-8:]
-            last_seen = oracle.last_seen.strftime("%H:%M:%S")
-            f.write(f"| `{oracle_short}` | {oracle.usage_count} | {oracle.associated_swaps} | {last_seen} |\n")
+            last_seen = _fmt_hms(oracle.last_seen)
+            buf.append(f"| `{oracle_short}` | {oracle.usage_count} | {oracle.associated_swaps} | {last_seen} |\n")
+
+        return "".join(buf)
 
-    def _write_technical_details(self, f, results: AnalysisResults):
-        """Write technical details section"""
-        f.write("\n## Technical Details\n\n")
+    def _write_technical_details(self, results: AnalysisResults) -> str:
+        """Build technical details section"""
+        buf: List[str] = []
+        buf.append("\n## Technical Details\n\n")
 
         # Raw discriminators
-        f.write("### Raw Instruction Discriminators\n\n")
-        f.write("```\n")
-        for disc in sorted(results.raw_discriminators):
-            f.write(f"{disc}\n")
-        f.write("```\n\n")
+        buf.append("### Raw Instruction Discriminators\n\n")
+        buf.append("```\n")
+        buf.extend(f"{disc.hex()}\n" for disc in results.raw_discriminators)
+        buf.append("```\n\n")
 
         # State patterns
-        f.write("### State Patterns Detected\n\n")
+        buf.append("### State Patterns Detected\n\n")
         for key, value in results.state_patterns.items():
-            f.write(f"- **{key.replace('_', ' ').title()}**: {value}\n")
+            buf.append(f"- **{key.replace('_', ' ').title()}**: {value}\n")
 
-    def _write_critical_findings(self, f, results: AnalysisResults):
-        """Write critical findings section"""
-        f.write("\n## Critical Findings\n\n")
+        return "".join(buf)
+
+    def _write_critical_findings(self, results: AnalysisResults) -> str:
+        """Build critical findings section"""
+        buf: List[str] = []
+        buf.append("\n## Critical Findings\n\n")
 
         if not results.critical_findings:
-            f.write("No critical findings identified.\n\n")
-            return
+            buf.append("No critical findings identified.\n\n")
+            return "".join(buf)
 
         for i, finding in enumerate(results.critical_findings, 1):
-            f.write(f"{i}. {finding}\n")
+            buf.append(f"{i}. {finding}\n")
 
-        f.write("\n## Next Steps\n\n")
-        f.write("1. **Deep Instruction Analysis**: Focus on high-frequency discriminators\n")
-        f.write("2. **Oracle Price Correlation**: Analyze oracle price feeds vs swap execution\n")
-        f.write("3. **State Layout Reverse Engineering**: Extract pool state structures\n")
-        f.write("4. **Algorithm Parameter Estimation**: Derive AMM curve parameters\n")
-        f.write("5. **EVM Portability Assessment**: Evaluate Ethereum deployment feasibility\n")
+        buf.append("\n## Next Steps\n\n")
+        buf.append("1. **Deep Instruction Analysis**: Focus on high-frequency discriminators\n")
+        buf.append("2. **Oracle Price Correlation**: Analyze oracle price feeds vs swap execution\n")
+        buf.append("3. **State Layout Reverse Engineering**: Extract pool state structures\n")
+        buf.append("4. **Algorithm Parameter Estimation**: Derive AMM curve parameters\n")
+        buf.append("5. **EVM Portability Assessment**: Evaluate Ethereum deployment feasibility\n")
+
+        return "".join(buf)
 
 # Main execution function
 async def main():
     """Main execution with comprehensive analysis"""
+    parser = argparse.ArgumentParser(description="Final optimized Lifinity V2 analyzer")
+    parser.add_argument("--max-concurrency", type=int, default=PARALLEL_REQUESTS,
+                        help="in-flight RPC requests per endpoint (default: %(default)s)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     print("=" * 70)
     print("🎯 FINAL OPTIMIZED LIFINITY V2 ANALYZER")
     print("🚀 Production-ready comprehensive analysis")
@@ -810,35 +1404,23 @@ async def main():
 
     try:
         # Initialize analyzer
-        analyzer = FinalOptimizedAnalyzer()
+        analyzer = FinalOptimizedAnalyzer(max_concurrency=args.max_concurrency)
 
         # Run comprehensive analysis
-        results = await analyzer.analyze_incremental(
-            max_time=30,
-            focus_areas=['instructions', 'swaps', 'oracles']
-        )
+        try:
+            results = await analyzer.analyze_incremental(
+                max_time=30,
+                focus_areas=['instructions', 'swaps', 'oracles']
+            )
+        finally:
+            await analyzer.aclose()
 
         # Generate comprehensive report
         reporter = ComprehensiveReporter()
         report_file = reporter.generate_full_report(results)
 
         # Generate JSON export for further processing
-        json_file = reporter.output_dir / f"lifinity_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(json_file, 'w') as f:
-            export_data = {
-                "metadata": {
-                    "analysis_time": datetime.now().isoformat(),
-                    "processing_time": results.processing_time,
-                    "coverage_stats": results.coverage_stats
-                },
-                "instructions": {disc: asdict(inst) for disc, inst in results.instructions.items()},
-                "swaps": [asdict(swap) for swap in results.swaps],
-                "oracles": {acc: asdict(oracle) for acc, oracle in results.oracles.items()},
-                "state_patterns": results.state_patterns,
-                "raw_discriminators": list(results.raw_discriminators),
-                "critical_findings": results.critical_findings
-            }
-            json.dump(export_data, f, indent=2, default=str)
+        json_file = reporter.export_json(results)
 
         # Final summary
         print("\n" + "=" * 70)
@@ -848,7 +1430,7 @@ async def main():
               f"(Success: {results.state_patterns['success_rate_percent']:.1f}%)")
         print(f"🔍 Instructions: {len(results.instructions)} "
               f"(High confidence: {results.state_patterns['high_confidence_instructions']})")
-        print(f"🔄 Swaps: {len(results.swaps)} "
+        print(f"🔄 Swaps: {results.swaps.total} "
               f"(Volume: {results.state_patterns['total_swap_volume']:,})")
         print(f"🔗 Oracles: {len(results.oracles)}")
         print(f"🗝️ Discriminators: {len(results.raw_discriminators)}")
@@ -865,8 +1447,8 @@ async def main():
         # Show top instructions
         if results.instructions:
             print("\n🔥 TOP INSTRUCTIONS:")
-            sorted_insts = sorted(results.instructions.values(), key=lambda x: x.frequency, reverse=True)
-            for inst in sorted_insts[:5]:
+            top_insts = heapq.nlargest(5, results.instructions.values(), key=attrgetter('frequency'))
+            for inst in top_insts:
                 critical = " ⭐" if inst.is_critical else ""
                 conf = f" ({inst.confidence:.2f})" if inst.confidence > 0.5 else ""
                 print(f"  {inst.name}: {inst.frequency} calls{conf}{critical}")
@@ -879,4 +1461,9 @@ async def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
+    try:
+        import uvloop  # libuv event loop; absent on Windows, where the default loop is used
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
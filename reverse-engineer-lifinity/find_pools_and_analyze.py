@@ -3,30 +3,94 @@
 Find actual Lifinity pools and analyze their transactions
 """
 
-import json
-import base58
+import base64
+import heapq
+import mmap
+import os
+import pickle
+import shelve
 import struct
 from datetime import datetime
 from pathlib import Path
-from collections import defaultdict
-from typing import Dict, List, Set
+from collections import Counter, OrderedDict
+from itertools import islice
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+import httpx
+import numpy as np
+import orjson
 from solana.rpc.api import Client
 from solders.pubkey import Pubkey
+from solders.transaction import VersionedTransaction
+from solders.transaction_status import TransactionConfirmationStatus
+from tqdm import tqdm
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; scan_discriminators falls back to NumPy
+    njit = None
 
 # Constants
 LIFINITY_V2_PROGRAM = "2wT8Yq49kHgDzXuPxZSaeLaH1qbmGXtEyPy64bL7aD3c"
 RPC_URL = "https://api.mainnet-beta.solana.com"
+TX_BATCH_SIZE = 25  # getTransaction calls per JSON-RPC batch
+JSON_HEADERS = {"Content-Type": "application/json"}  # Batch bodies are serialized with orjson
+ACCOUNT_CACHE_FILE = Path("lifinity_results") / "account_cache.pkl"
+ACCOUNT_CACHE_SIZE = 1024  # LRU capacity, in accounts
+TX_CACHE_FILE = Path("lifinity_results") / "tx_cache"
+
+# Lifinity instructions of one transaction: (data, account keys) pairs
+ParsedTx = List[Tuple[bytes, List[bytes]]]
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _entropy_mask(windows):
+        """Flag 8-byte windows holding 3 to 7 distinct byte values"""
+        out = np.empty(windows.shape[0], np.bool_)
+        for i in prange(windows.shape[0]):
+            distinct = 0
+            for j in range(8):
+                seen = False
+                for k in range(j):
+                    if windows[i, k] == windows[i, j]:
+                        seen = True
+                        break
+                if not seen:
+                    distinct += 1
+            out[i] = 3 <= distinct <= 7
+        return out
+else:
+    _entropy_mask = None
 
 class PoolFinder:
     """Find and analyze Lifinity pools"""
 
     def __init__(self):
+        self.http = httpx.Client(
+            http2=True,
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=32)
+        )
+
+        # Route solana-py calls over the same pooled HTTP/2 connection
         self.client = Client(RPC_URL)
+        self.client._provider.session.close()
+        self.client._provider.session = self.http
         self.program_id = Pubkey.from_string(LIFINITY_V2_PROGRAM)
+        self.program_bytes = bytes(self.program_id)
         self.pools_found = {}
         self.instructions = {}
-        self.account_frequency = defaultdict(int)
+        self.account_frequency = Counter()
+        self.account_cache = self.load_account_cache()
+
+        # Finalized transactions are immutable, so their parsed form is kept on disk
+        TX_CACHE_FILE.parent.mkdir(exist_ok=True)
+        self.tx_cache = shelve.open(str(TX_CACHE_FILE))
+
+    def close(self):
+        """Release the HTTP connection pool and the transaction cache"""
+        self.http.close()
+        self.tx_cache.close()
 
     def find_pools(self):
         """Find pools by analyzing recent program transactions"""
@@ -43,15 +107,20 @@ class PoolFinder:
                 print("No transactions found")
                 return
 
-            signatures = response.value
-            print(f"Found {len(signatures)} recent transactions")
+            # Failed transactions carry no useful state, so never fetch them
+            signatures = [s for s in response.value if s.err is None]
+            print(f"Found {len(response.value)} recent transactions ({len(signatures)} successful)")
 
             # Analyze transactions to find frequently used accounts (likely pools)
-            for i, sig_info in enumerate(signatures[:50]):  # Analyze first 50
-                if i % 10 == 0:
-                    print(f"  Processing {i+1}/{min(50, len(signatures))}...")
+            to_analyze = signatures[:50]  # Analyze first 50
+            with tqdm(total=len(to_analyze), desc="txs", unit="tx") as progress:
+                for start in range(0, len(to_analyze), TX_BATCH_SIZE):
+                    batch = to_analyze[start:start + TX_BATCH_SIZE]
 
-                self.analyze_transaction_for_pools(sig_info)
+                    for sig_info, parsed in zip(batch, self.load_transactions(batch)):
+                        if parsed is not None:
+                            self.analyze_transaction_for_pools(parsed, sig_info)
+                    progress.update(len(batch))
 
             # Identify pools from most frequently accessed accounts
             self.identify_pools()
@@ -65,115 +134,181 @@ class PoolFinder:
         except Exception as e:
             print(f"Error: {e}")
 
-    def analyze_transaction_for_pools(self, sig_info):
-        """Analyze a transaction to find pool accounts"""
-        try:
-            # Get transaction
-            tx_response = self.client.get_transaction(
-                sig_info.signature,
-                max_supported_transaction_version=0,
-                encoding="jsonParsed"
-            )
+    def load_transactions(self, sig_infos) -> List[Optional[ParsedTx]]:
+        """Parsed Lifinity instructions per signature, from the disk cache or RPC"""
+        parsed = [self.tx_cache.get(str(sig_info.signature)) for sig_info in sig_infos]
+        misses = [i for i, cached in enumerate(parsed) if cached is None]
+
+        if misses:
+            fetched = self.fetch_transactions([sig_infos[i] for i in misses])
+            for i, tx in zip(misses, fetched):
+                if not tx:
+                    continue
+
+                parsed[i] = self.parse_transaction(tx)
+                sig_info = sig_infos[i]
+                if (parsed[i] is not None and
+                        sig_info.confirmation_status == TransactionConfirmationStatus.Finalized):
+                    self.tx_cache[str(sig_info.signature)] = parsed[i]
+
+        return parsed
+
+    def fetch_transactions(self, sig_infos) -> List[Optional[Dict[str, Any]]]:
+        """Fetch transactions with a single JSON-RPC batch request"""
+        batch = [
+            {
+                "jsonrpc": "2.0",
+                "id": i,
+                "method": "getTransaction",
+                "params": [
+                    str(sig_info.signature),
+                    {"encoding": "base64", "maxSupportedTransactionVersion": 0}
+                ]
+            }
+            for i, sig_info in enumerate(sig_infos)
+        ]
 
-            if not tx_response or not tx_response.value:
-                return
+        try:
+            response = self.http.post(RPC_URL, content=orjson.dumps(batch), headers=JSON_HEADERS)
+            response.raise_for_status()
+            replies = orjson.loads(response.content)
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"  Batch request failed: {e}")
+            return [None] * len(sig_infos)
+
+        # Replies may arrive in any order; match them back by id
+        results = [None] * len(sig_infos)
+        if isinstance(replies, list):
+            for reply in replies:
+                idx = reply.get("id")
+                if isinstance(idx, int) and 0 <= idx < len(results):
+                    results[idx] = reply.get("result")
+        return results
+
+    def parse_transaction(self, tx) -> Optional[ParsedTx]:
+        """Reduce a base64 transaction to its Lifinity instructions"""
+        try:
+            # Decode the wire-format transaction locally
+            raw = base64.b64decode(tx["transaction"][0])
+            message = VersionedTransaction.from_bytes(raw).message
 
-            tx = tx_response.value
+            # Raw 32-byte keys; base58 is only produced for reported accounts
+            account_keys = [bytes(k) for k in message.account_keys]
+            loaded = (tx.get("meta") or {}).get("loadedAddresses")
+            if loaded:
+                account_keys += [bytes(Pubkey.from_string(k)) for k in loaded["writable"] + loaded["readonly"]]
 
-            # Look for program instructions
-            if hasattr(tx.transaction, 'message'):
-                message = tx.transaction.message
+            # Resolve the program's key index once per transaction
+            try:
+                program_idx = account_keys.index(self.program_bytes)
+            except ValueError:
+                return []
 
-                # Process instructions
-                for ix in message.instructions:
-                    # Check if it's a Lifinity instruction
-                    if hasattr(ix, 'programId') and str(ix.programId) == LIFINITY_V2_PROGRAM:
-                        # This is a Lifinity instruction
-                        self.process_lifinity_instruction(ix, sig_info)
+            key_count = len(account_keys)
+            return [
+                (bytes(ix.data), [account_keys[acc_idx] for acc_idx in ix.accounts if acc_idx < key_count])
+                for ix in message.instructions
+                if ix.program_id_index == program_idx
+            ]
 
-                    # Also check parsed instructions
-                    elif hasattr(ix, 'program') and ix.program == 'unknown':
-                        # Check if it references our program
-                        if hasattr(ix, 'accounts'):
-                            for acc in ix.accounts:
-                                self.account_frequency[str(acc)] += 1
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None  # Malformed or missing transaction payload
 
-        except Exception as e:
-            pass  # Continue on errors
+    def analyze_transaction_for_pools(self, parsed: ParsedTx, sig_info):
+        """Analyze a transaction to find pool accounts"""
+        for data, accounts in parsed:
+            self.process_lifinity_instruction(data, accounts, sig_info)
 
-    def process_lifinity_instruction(self, instruction, sig_info):
+    def process_lifinity_instruction(self, data: bytes, accounts: List[bytes], sig_info):
         """Process a Lifinity instruction"""
-        try:
-            # Track accounts used
-            if hasattr(instruction, 'accounts'):
-                for acc in instruction.accounts:
-                    self.account_frequency[str(acc)] += 1
-
-            # Try to extract instruction data
-            if hasattr(instruction, 'data'):
-                data_str = instruction.data
-                try:
-                    # Try base58 decode
-                    data = base58.b58decode(data_str) if isinstance(data_str, str) else bytes(data_str)
-
-                    if len(data) >= 8:
-                        # Extract discriminator
-                        discriminator = data[:8].hex()
-
-                        if discriminator not in self.instructions:
-                            self.instructions[discriminator] = {
-                                'count': 0,
-                                'data_sizes': [],
-                                'first_seen': str(sig_info.signature)
-                            }
-
-                        self.instructions[discriminator]['count'] += 1
-                        self.instructions[discriminator]['data_sizes'].append(len(data))
-
-                except:
-                    pass
+        # Track accounts used, tallied in one Counter.update per instruction
+        self.account_frequency.update(accounts)
 
-        except Exception as e:
-            pass
+        if len(data) >= 8:
+            # Extract discriminator
+            discriminator = data[:8].hex()
+
+            if discriminator not in self.instructions:
+                self.instructions[discriminator] = {
+                    'count': 0,
+                    'data_sizes': [],
+                    'first_seen': str(sig_info.signature)
+                }
+
+            self.instructions[discriminator]['count'] += 1
+            self.instructions[discriminator]['data_sizes'].append(len(data))
 
     def identify_pools(self):
         """Identify likely pool accounts from frequency analysis"""
         print("\n📊 Analyzing account frequencies...")
 
-        # Sort accounts by frequency
-        sorted_accounts = sorted(
-            self.account_frequency.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-
         # Top accounts are likely pools or vaults
+        top_accounts = [(str(Pubkey(acc)), freq) for acc, freq in self.account_frequency.most_common(10)]
+        account_infos = self.fetch_account_infos([acc for acc, _ in top_accounts])
+
         print(f"Top frequently accessed accounts (likely pools/vaults):")
-        for acc, freq in sorted_accounts[:10]:
+        for acc, freq in top_accounts:
             print(f"  {acc[:8]}...{acc[-6:]}: {freq} times")
 
-            # Try to get account info to determine if it's a pool
+            # Use account info to determine if it's a pool
+            info = account_infos.get(acc)
+            if info:
+                owner, data_len = info
+
+                # Pools typically have specific data sizes
+                if owner == LIFINITY_V2_PROGRAM and 200 < data_len < 500:
+                    self.pools_found[acc] = {
+                        'frequency': freq,
+                        'data_size': data_len,
+                        'type': 'likely_pool'
+                    }
+                    print(f"    → Likely POOL (size: {data_len}B)")
+                elif owner == "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA":
+                    print(f"    → Token account (vault)")
+
+    def load_account_cache(self) -> "OrderedDict[str, Tuple[str, int]]":
+        """Load the on-disk account info cache"""
+        try:
+            with open(ACCOUNT_CACHE_FILE, 'rb') as f:
+                return OrderedDict(pickle.load(f))
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return OrderedDict()
+
+    def save_account_cache(self):
+        """Persist the account info cache, evicting least recently used entries"""
+        while len(self.account_cache) > ACCOUNT_CACHE_SIZE:
+            self.account_cache.popitem(last=False)
+
+        try:
+            ACCOUNT_CACHE_FILE.parent.mkdir(exist_ok=True)
+            with open(ACCOUNT_CACHE_FILE, 'wb') as f:
+                pickle.dump(dict(self.account_cache), f)
+        except OSError as e:
+            print(f"  Could not save account cache: {e}")
+
+    def fetch_account_infos(self, addresses: List[str]) -> Dict[str, Tuple[str, int]]:
+        """Owner and data size per account, fetching cache misses in one getMultipleAccounts call"""
+        missing = [acc for acc in addresses if acc not in self.account_cache]
+
+        if missing:
             try:
-                pubkey = Pubkey.from_string(acc)
-                acc_info = self.client.get_account_info(pubkey)
-
-                if acc_info and acc_info.value:
-                    data_len = len(acc_info.value.data)
-                    owner = str(acc_info.value.owner)
-
-                    # Pools typically have specific data sizes
-                    if owner == LIFINITY_V2_PROGRAM and 200 < data_len < 500:
-                        self.pools_found[acc] = {
-                            'frequency': freq,
-                            'data_size': data_len,
-                            'type': 'likely_pool'
-                        }
-                        print(f"    → Likely POOL (size: {data_len}B)")
-                    elif owner == "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA":
-                        print(f"    → Token account (vault)")
-
-            except:
-                pass
+                response = self.client.get_multiple_accounts([Pubkey.from_string(acc) for acc in missing])
+                for acc, info in zip(missing, response.value):
+                    # Missing accounts may be created later, so they are not cached
+                    if info is not None:
+                        self.account_cache[acc] = (str(info.owner), len(info.data))
+            except Exception as e:
+                print(f"  Account lookup failed: {e}")
+
+        infos = {}
+        for acc in addresses:
+            if acc in self.account_cache:
+                self.account_cache.move_to_end(acc)
+                infos[acc] = self.account_cache[acc]
+
+        if missing:
+            self.save_account_cache()
+        return infos
 
     def extract_instruction_patterns(self):
         """Extract and analyze instruction patterns"""
@@ -183,7 +318,7 @@ class PoolFinder:
             # Try to extract from binary
             self.extract_from_binary()
 
-        for disc, info in sorted(self.instructions.items(), key=lambda x: x[1]['count'], reverse=True)[:10]:
+        for disc, info in heapq.nlargest(10, self.instructions.items(), key=lambda x: x[1]['count']):
             avg_size = sum(info['data_sizes']) / len(info['data_sizes']) if info['data_sizes'] else 0
             print(f"  {disc[:16]}...: {info['count']} calls, avg {avg_size:.0f}B")
 
@@ -192,28 +327,15 @@ class PoolFinder:
         print("\n🔧 Extracting from binary...")
 
         try:
-            # Read some of the binary directly
+            # Map the binary read-only; pages are faulted in as the scan touches them
             with open("lifinity_v2.so", "rb") as f:
-                binary_data = f.read(100000)  # First 100KB
+                if os.fstat(f.fileno()).st_size == 0:
+                    found, patterns = 0, []
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        found, patterns = self.scan_discriminators(mm, limit=100000)  # First 100KB
 
-            # Look for potential discriminators (8-byte patterns)
-            # Common patterns in Solana programs
-            patterns = []
-
-            # Look for sequences that might be discriminators
-            for i in range(0, len(binary_data) - 8, 8):
-                eight_bytes = binary_data[i:i+8]
-
-                # Check if it looks like a discriminator (not all zeros, not all FFs)
-                if eight_bytes != b'\x00' * 8 and eight_bytes != b'\xff' * 8:
-                    # Check for reasonable entropy
-                    unique_bytes = len(set(eight_bytes))
-                    if 3 <= unique_bytes <= 7:  # Reasonable entropy
-                        disc = eight_bytes.hex()
-                        if disc not in patterns:
-                            patterns.append(disc)
-
-            print(f"  Found {len(patterns)} potential discriminators in binary")
+            print(f"  Found {found} potential discriminators in binary")
 
             # Add the most likely ones
             for disc in patterns[:10]:
@@ -227,6 +349,34 @@ class PoolFinder:
         except Exception as e:
             print(f"  Error reading binary: {e}")
 
+    @staticmethod
+    def scan_discriminators(buffer, limit: int) -> Tuple[int, List[str]]:
+        """Count candidate discriminators in a buffer and return the first ten.
+
+        Views over ``buffer`` are local to this call, so a backing mmap can be
+        closed as soon as it returns.
+        """
+        # Look for potential discriminators (8-byte aligned patterns)
+        # Common patterns in Solana programs
+        size = min(len(buffer), limit)
+        window_count = max(0, -(-(size - 8) // 8))
+        windows = np.frombuffer(buffer, dtype=np.uint8, count=window_count * 8).reshape(-1, 8)
+
+        # Distinct bytes per window; all-zero and all-FF windows count as 1
+        if _entropy_mask is not None:
+            mask = _entropy_mask(windows)
+        else:
+            sorted_windows = np.sort(windows, axis=1)
+            unique_bytes = 1 + np.count_nonzero(np.diff(sorted_windows, axis=1), axis=1)
+            mask = (unique_bytes >= 3) & (unique_bytes <= 7)
+        candidates = windows[mask]  # Reasonable entropy
+
+        # Deduplicate while keeping first-seen order
+        keys = np.ascontiguousarray(candidates).view(np.uint64).ravel()
+        _, first_index = np.unique(keys, return_index=True)
+        first_index.sort()
+        return len(first_index), [candidates[i].tobytes().hex() for i in first_index[:10]]
+
     def generate_report(self):
         """Generate comprehensive report"""
         print("\n" + "=" * 60)
@@ -254,7 +404,9 @@ class PoolFinder:
             'program_id': LIFINITY_V2_PROGRAM,
             'pools_found': self.pools_found,
             'instructions': self.instructions,
-            'account_frequencies': dict(list(self.account_frequency.items())[:20]),
+            'account_frequencies': {
+                str(Pubkey(acc)): freq for acc, freq in islice(self.account_frequency.items(), 20)
+            },
             'analysis': {
                 'total_transactions_analyzed': len(self.account_frequency),
                 'unique_accounts': len(set(self.account_frequency.keys())),
@@ -262,8 +414,7 @@ class PoolFinder:
             }
         }
 
-        with open(results_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        results_file.write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
 
         print(f"\n💾 Results saved to: {results_file}")
 
@@ -282,7 +433,10 @@ class PoolFinder:
 
 def main():
     finder = PoolFinder()
-    finder.find_pools()
+    try:
+        finder.find_pools()
+    finally:
+        finder.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,54 +3,189 @@
 Real Lifinity V2 Analyzer - Focused on actual data extraction
 """
 
+import argparse
+import hashlib
 import json
-import base58
+import logging
+import re
+import time
 import struct
 import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Set
+from itertools import islice
+from typing import Any, Dict, List, Set
 from pathlib import Path
 
 import httpx
+import numpy as np
 from solana.rpc.api import Client
 from solders.pubkey import Pubkey
 from solders.signature import Signature
 
+try:
+    import based58 as b58  # Rust base58 codec; same bytes-in/bytes-out API
+except ImportError:
+    import base58 as b58
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; analyze_binary falls back to the regex scan
+    njit = None
+
 # Constants
 LIFINITY_V2_PROGRAM = "2wT8Yq49kHgDzXuPxZSaeLaH1qbmGXtEyPy64bL7aD3c"
 RPC_URL = "https://api.mainnet-beta.solana.com"
 
+# Async RPC fan-out
+MAX_CONCURRENCY = 10  # In-flight JSON-RPC requests; public RPC rate-limits hard, paid plans take ~64
+RETRY_ATTEMPTS = 5
+RETRY_BACKOFF = 0.5  # Seconds, doubled on every retry
+RPC_BATCH_SIZE = 20  # Calls per JSON-RPC batch; public providers degrade above this
+JSON_HEADERS = {"Content-Type": "application/json"}  # For bodies pre-serialized with orjson
+
+# On-disk RPC response cache; finalized transactions never change, so only
+# methods listed here expire (seconds)
+RPC_CACHE_DIR = Path("lifinity_results") / "rpc_cache"
+RPC_CACHE_TTL = {"getSignaturesForAddress": 3600}
+
+logger = logging.getLogger(__name__)
+
+@dataclass(slots=True)
+class IxView:
+    """Program instruction normalized once from the RPC json"""
+    data: Any  # base58 string (or raw bytes); None when absent
+    accounts: List[int]
+    prog_id: str
+
 # Known Lifinity pool accounts (from on-chain data)
 KNOWN_POOLS = {
     "SOL-USDC": "EpUPs4DFGvUUpSkaygBGXXVT2n1LBqDemfMBNUuzhLui",
     "SOL-USDT": "9gqMrvoYB2fyDB17YquQFBaUGgDQYmtkSBHBH3DtVKJu",
     "mSOL-USDC": "2wLy3Q8qTAwJZnGJC5osSYZz8gKkBP4ajPRMBQf1v4uu",
 }
+KNOWN_POOL_PUBKEYS = {name: Pubkey.from_string(addr) for name, addr in KNOWN_POOLS.items()}
+VAULT_SLICES = ((72, 104), (104, 136))  # Token A / B vault pubkeys in pool state
+VAULTS_END = VAULT_SLICES[-1][1]
+
+# 8-byte hex constants in the disassembly (potential discriminators)
+DISASM_SCAN_LINES = 1000
+_DISC_RE = re.compile(rb'0x([0-9a-fA-F]{16})')
+
+if njit is not None:
+    @njit(cache=True)
+    def _scan_hex_constants(buf, out):
+        """Collect "0x" + 16 hex digit constants from ASCII bytes into ``out``.
+
+        Matches are non-overlapping, left to right, like ``_DISC_RE.findall``.
+        Returns the number of values written.
+        """
+        n = 0
+        i = 0
+        end = len(buf) - 18
+        while i <= end:
+            if buf[i] == 0x30 and buf[i + 1] == 0x78:  # "0x"
+                value = np.uint64(0)
+                ok = True
+                for j in range(i + 2, i + 18):
+                    c = buf[j]
+                    if 0x30 <= c <= 0x39:
+                        digit = c - 0x30
+                    elif 0x61 <= c <= 0x66:
+                        digit = c - 0x57
+                    elif 0x41 <= c <= 0x46:
+                        digit = c - 0x37
+                    else:
+                        ok = False
+                        break
+                    value = (value << np.uint64(4)) | np.uint64(digit)
+                if ok:
+                    out[n] = value
+                    n += 1
+                    i += 18
+                    continue
+            i += 1
+        return n
+else:
+    _scan_hex_constants = None
+
+# Instruction data encodings, checked by character set rather than try/except
+_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_HEX_DIGITS = "0123456789abcdefABCDEF"
+
+def _decode_ix_data(raw):
+    """Decode instruction data from an RPC response; None if unrecognized.
+
+    RPC json encoding returns base58, so it keeps precedence; strings outside
+    the base58 alphabet (e.g. containing '0') are tried as hex.
+    """
+    if not isinstance(raw, str):
+        return bytes(raw)  # Already raw bytes / byte list
+    if not raw.strip(_B58_ALPHABET):
+        return b58.b58decode(raw.encode())
+    if len(raw) % 2 == 0 and not raw.strip(_HEX_DIGITS):
+        return bytes.fromhex(raw)
+    return None
+
+# Instruction type by data length (common patterns)
+_TYPE_BY_LEN = {
+    16: "swap_exact_in",
+    24: "swap_exact_out",
+    32: "add_liquidity",
+    40: "remove_liquidity",
+}
 
 class LifinityRealAnalyzer:
     """Focused analyzer for real Lifinity data"""
 
-    def __init__(self):
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY):
         self.client = Client(RPC_URL)
-        self.instructions_found = {}
-        self.discriminators = set()
+        self.http = None  # httpx.AsyncClient, open for the duration of analyze()
+        self.rpc_limit = asyncio.Semaphore(max_concurrency)
+        # Instruction table as parallel columns; _disc_index maps discriminator -> row
+        self._disc_index: Dict[str, int] = {}
+        self.discs: List[str] = []
+        self.types: List[str] = []
+        self.sizes: List[int] = []
+        self.pools: List[str] = []
+        self.acc_counts: List[int] = []
+        self._disasm_discs: Set[str] = set()  # Discriminator candidates seen only in the disassembly
+        self._seen_data: Set[str] = set()  # Raw instruction payloads already decoded
         self.pool_interactions = []
         self.results_dir = Path("lifinity_results")
         self.results_dir.mkdir(exist_ok=True)
+        RPC_CACHE_DIR.mkdir(exist_ok=True)
+        # Append-only log of discoveries and parsed signatures, replayed on rerun
+        self.progress_file = self.results_dir / "discs.jsonl"
+        self._progress = None
+        self._seen_sigs: Set[str] = set()
 
-    def analyze(self):
+    async def analyze(self):
         """Main analysis with pool-focused approach"""
         print("=" * 60)
         print("🔍 LIFINITY V2 REAL DATA ANALYZER")
         print("=" * 60)
 
+        # Resume from an earlier run's progress log
+        self.load_progress()
+
         # Step 1: Analyze known pools
         print("\n📊 Step 1: Analyzing known pools...")
         self.analyze_known_pools()
 
         # Step 2: Find recent pool interactions
         print("\n📊 Step 2: Finding pool interactions...")
-        self.find_pool_interactions()
+        limits = httpx.Limits(max_connections=64, max_keepalive_connections=64)
+        with open(self.progress_file, "ab") as self._progress:
+            async with httpx.AsyncClient(http2=True, limits=limits, timeout=30) as self.http:
+                await self.find_pool_interactions()
+        self._progress = None
 
         # Step 3: Extract instructions from transactions
         print("\n📊 Step 3: Extracting instructions...")
@@ -64,23 +199,79 @@ class LifinityRealAnalyzer:
         print("\n📊 Step 5: Generating report...")
         self.generate_report()
 
+    def load_progress(self):
+        """Replay discs.jsonl: restore found instructions and parsed signatures"""
+        good_end = 0  # Offset just past the last newline-terminated line
+        try:
+            with open(self.progress_file, "r+b") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Torn final line from an interrupted run: cut it so the
+                        # next appended record starts on its own line
+                        f.truncate(good_end)
+                        break
+                    good_end += len(line)
+                    try:
+                        record = orjson.loads(line) if orjson is not None else json.loads(line)
+                    except ValueError:
+                        continue
+                    if "sig" in record:
+                        self._seen_sigs.add(record["sig"])
+                    elif record.get("disc") not in self._disc_index:
+                        self.add_instruction(record["disc"], record["type"], record["data_size"],
+                                             record["pool"], record["account_count"])
+        except OSError:
+            return
+        if self._seen_sigs or self.discs:
+            print(f"  Resumed {len(self.discs)} instructions from {len(self._seen_sigs)} parsed transactions")
+
+    def log_progress(self, record):
+        """Append one record to the progress log, flushed so a crash keeps it"""
+        if self._progress is None:
+            return
+        line = orjson.dumps(record) if orjson is not None else json.dumps(record).encode()
+        self._progress.write(line + b"\n")
+        self._progress.flush()
+
+    def add_instruction(self, disc, instruction_type, data_size, pool, account_count):
+        """Append one row to the instruction columns"""
+        self._disc_index[disc] = len(self.discs)
+        self.discs.append(disc)
+        self.types.append(instruction_type)
+        self.sizes.append(data_size)
+        self.pools.append(pool)
+        self.acc_counts.append(account_count)
+
     def analyze_known_pools(self):
         """Analyze known pool accounts"""
-        for pool_name, pool_addr in KNOWN_POOLS.items():
+        # Fetch every pool account in one getMultipleAccounts round trip
+        try:
+            accounts = self.client.get_multiple_accounts(list(KNOWN_POOL_PUBKEYS.values())).value
+        except Exception as e:
+            print(f"  ⚠️  Error fetching pool accounts: {e}")
+            return
+
+        # Gather all parseable pool states into one (n_pools, VAULTS_END) array
+        # so both vault ranges come out as column slices
+        parsed = [i for i, account in enumerate(accounts) if account and len(account.data) > 200]
+        vaults = {}
+        if parsed:
+            states = np.stack([
+                np.frombuffer(accounts[i].data, dtype=np.uint8, count=VAULTS_END) for i in parsed
+            ])
+            vault_columns = [states[:, start:end] for start, end in VAULT_SLICES]
+            for row, i in enumerate(parsed):
+                vaults[i] = [b58.b58encode(column[row].tobytes())[:8].decode() for column in vault_columns]
+
+        for i, ((pool_name, pool_addr), account) in enumerate(zip(KNOWN_POOLS.items(), accounts)):
             try:
-                # Get pool account info
-                pubkey = Pubkey.from_string(pool_addr)
-                response = self.client.get_account_info(pubkey)
-
-                if response.value:
+                if account:
                     print(f"  ✅ Pool {pool_name}: {pool_addr[:8]}...")
-                    data = response.value.data
 
                     # Parse basic pool data
-                    if len(data) > 200:
+                    if i in vaults:
                         # Extract some key fields (assuming standard layout)
-                        token_a_vault = base58.b58encode(data[72:104]).decode()[:8]
-                        token_b_vault = base58.b58encode(data[104:136]).decode()[:8]
+                        token_a_vault, token_b_vault = vaults[i]
                         print(f"      Vaults: A={token_a_vault}... B={token_b_vault}...")
                 else:
                     print(f"  ❌ Pool {pool_name} not found")
@@ -88,115 +279,222 @@ class LifinityRealAnalyzer:
             except Exception as e:
                 print(f"  ⚠️  Error analyzing {pool_name}: {e}")
 
-    def find_pool_interactions(self):
-        """Find recent transactions interacting with pools"""
-        for pool_name, pool_addr in KNOWN_POOLS.items():
+    async def post_json(self, body, label):
+        """POST a JSON-RPC body, retrying 429s and transient failures with backoff"""
+        for attempt in range(RETRY_ATTEMPTS):
+            last_attempt = attempt == RETRY_ATTEMPTS - 1
+            delay = RETRY_BACKOFF * 2 ** attempt
             try:
-                pubkey = Pubkey.from_string(pool_addr)
-
-                # Get recent signatures for this pool
-                response = self.client.get_signatures_for_address(pubkey, limit=10)
-
-                if response.value:
-                    print(f"  Found {len(response.value)} txs for {pool_name}")
-
-                    # Process each transaction
-                    for sig_info in response.value[:5]:  # Limit to 5 per pool
-                        self.process_pool_transaction(sig_info.signature, pool_name)
-
-            except Exception as e:
-                print(f"  ⚠️  Error finding interactions for {pool_name}: {e}")
+                # Hold a concurrency slot for the round-trip only, never across a backoff sleep
+                async with self.rpc_limit:
+                    if orjson is not None:
+                        response = await self.http.post(RPC_URL, content=orjson.dumps(body), headers=JSON_HEADERS)
+                    else:
+                        response = await self.http.post(RPC_URL, json=body)
+                if response.status_code == 429:
+                    # Honour the server's Retry-After when it sends one
+                    try:
+                        delay = max(delay, float(response.headers.get("retry-after", 0)))
+                    except ValueError:
+                        pass
+                    logger.debug("%s rate limited, retrying in %.2fs", label, delay)
+                elif 400 <= response.status_code < 500:
+                    # Any other client error is permanent, retrying will not help
+                    print(f"  ⚠️  {label} failed: HTTP {response.status_code}")
+                    return None
+                elif response.status_code < 400:
+                    return orjson.loads(response.content) if orjson is not None else response.json()
+            except (httpx.HTTPError, ValueError) as e:
+                if last_attempt:
+                    print(f"  ⚠️  {label} failed: {e}")
+                    return None
+                logger.debug("%s failed (%s), retrying in %.2fs", label, e, delay)
+            if not last_attempt:
+                await asyncio.sleep(delay)
+        print(f"  ⚠️  {label} gave up after {RETRY_ATTEMPTS} attempts")
+        return None
+
+    @staticmethod
+    def cache_path(method, params) -> Path:
+        """Content-addressed cache file for one (method, params) call"""
+        if orjson is not None:
+            canonical = method.encode() + orjson.dumps(params, option=orjson.OPT_SORT_KEYS)
+        else:
+            canonical = (method + json.dumps(params, sort_keys=True, separators=(",", ":"))).encode()
+        key = hashlib.blake2b(canonical, digest_size=16)
+        return RPC_CACHE_DIR / f"{key.hexdigest()}.json"
 
-    def process_pool_transaction(self, signature, pool_name):
-        """Process a transaction involving a pool"""
+    def cache_get(self, method, params):
+        """Cached result for a call, or None when missing or expired"""
+        path = self.cache_path(method, params)
         try:
-            # Get transaction details
-            tx_response = self.client.get_transaction(
-                signature,
-                max_supported_transaction_version=0,
-                encoding="json"
-            )
-
-            if not tx_response.value:
+            ttl = RPC_CACHE_TTL.get(method)
+            if ttl is not None and time.time() - path.stat().st_mtime > ttl:
+                return None
+            raw = path.read_bytes()
+        except OSError:
+            return None
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+    async def cache_put(self, method, params, result):
+        """Store a non-empty result off the event loop"""
+        if result is None:
+            return
+        raw = orjson.dumps(result) if orjson is not None else json.dumps(result).encode()
+        await asyncio.to_thread(self.cache_path(method, params).write_bytes, raw)
+
+    async def post_rpc(self, method, params):
+        """Single JSON-RPC call; returns the result or None"""
+        cached = self.cache_get(method, params)
+        if cached is not None:
+            return cached
+
+        body = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+        reply = await self.post_json(body, method)
+        result = reply.get("result") if isinstance(reply, dict) else None
+        await self.cache_put(method, params, result)
+        return result
+
+    async def rpc_batch(self, calls):
+        """Send (method, params) calls as one JSON-RPC batch array.
+
+        Cached calls are answered from disk and left out of the batch.
+        Replies are matched back by id, since servers may reorder them;
+        the result list follows ``calls`` with None for missing entries.
+        """
+        results = [self.cache_get(method, params) for method, params in calls]
+        body = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+            if results[i] is None
+        ]
+        if not body:
+            return results
+
+        replies = await self.post_json(body, "batch")
+        if isinstance(replies, list):
+            for reply in replies:
+                idx = reply.get("id")
+                if isinstance(idx, int) and 0 <= idx < len(results) and results[idx] is None:
+                    results[idx] = reply.get("result")
+                    await self.cache_put(*calls[idx], results[idx])
+        return results
+
+    async def find_pool_interactions(self):
+        """Find recent transactions interacting with pools"""
+        # Get recent signatures for every pool concurrently
+        pool_names = list(KNOWN_POOLS)
+        signature_lists = await asyncio.gather(*(
+            self.post_rpc("getSignaturesForAddress", [addr, {"limit": 10}])
+            for addr in KNOWN_POOLS.values()
+        ))
+
+        # A transaction touching several pools is fetched once
+        sig_to_pools: Dict[str, List[str]] = defaultdict(list)
+        for pool_name, sig_infos in zip(pool_names, signature_lists):
+            if sig_infos:
+                print(f"  Found {len(sig_infos)} txs for {pool_name}")
+                # Failed transactions are known from the signature listing; skip fetching them
+                landed = (sig_info for sig_info in sig_infos if sig_info.get("err") is None)
+                for sig_info in islice(landed, 5):  # Limit to 5 per pool
+                    if sig_info["signature"] not in self._seen_sigs:  # Parsed in an earlier run
+                        sig_to_pools[sig_info["signature"]].append(pool_name)
+
+        # Fetch all transactions in JSON-RPC batches of at most RPC_BATCH_SIZE
+        tx_config = {"encoding": "json", "maxSupportedTransactionVersion": 0}
+        it = iter(sig_to_pools.items())
+        chunks = list(iter(lambda: list(islice(it, RPC_BATCH_SIZE)), []))
+        batches = await asyncio.gather(*(
+            self.rpc_batch([("getTransaction", [signature, tx_config]) for signature, _ in chunk])
+            for chunk in chunks
+        ))
+
+        for chunk, txs in zip(chunks, batches):
+            for (signature, pools), tx in zip(chunk, txs):
+                if tx:
+                    self.process_pool_transaction(tx, pools[0])
+                    self._seen_sigs.add(signature)
+                    self.log_progress({'sig': signature})
+
+    def process_pool_transaction(self, tx, pool_name):
+        """Process a transaction involving a pool (first pool it was found under)"""
+        try:
+            if not tx:
                 return
 
-            tx = tx_response.value
-
             # Find Lifinity instructions
-            if tx.transaction and hasattr(tx.transaction, 'message'):
-                message = tx.transaction.message
-
-                # Look for instructions to Lifinity program
-                for idx, ix in enumerate(message.instructions):
-                    if hasattr(ix, 'programIdIndex'):
-                        prog_idx = ix.programIdIndex
-                        if prog_idx < len(message.accountKeys):
-                            prog_key = message.accountKeys[prog_idx]
-                            if prog_key == LIFINITY_V2_PROGRAM:
-                                self.extract_instruction_data(ix, pool_name)
-
-        except Exception as e:
-            pass  # Silently skip errors to continue processing
-
-    def extract_instruction_data(self, instruction, pool_name):
+            message = tx["transaction"]["message"]
+            account_keys = message["accountKeys"]
+
+            # Look for instructions to Lifinity program
+            for ix in message["instructions"]:
+                prog_idx = ix.get("programIdIndex")
+                if prog_idx is not None and prog_idx < len(account_keys):
+                    prog_key = account_keys[prog_idx]
+                    if prog_key == LIFINITY_V2_PROGRAM:
+                        view = IxView(data=ix.get("data"), accounts=ix.get("accounts") or [], prog_id=prog_key)
+                        self.extract_instruction_data(view, pool_name)
+
+        except (KeyError, IndexError, TypeError) as e:
+            logger.debug("Skipping malformed transaction for %s: %r", pool_name, e)
+
+    def extract_instruction_data(self, instruction: IxView, pool_name):
         """Extract instruction discriminator and data"""
         try:
             # Get instruction data
-            if hasattr(instruction, 'data'):
+            if instruction.data is not None:
                 data_str = instruction.data
 
-                # Decode base58 data
-                if isinstance(data_str, str):
-                    try:
-                        data = base58.b58decode(data_str)
-                    except:
-                        # Try as hex
-                        data = bytes.fromhex(data_str)
-                else:
-                    data = bytes(data_str)
+                # Identical payloads decode to an already-recorded discriminator
+                if data_str in self._seen_data:
+                    return
+                self._seen_data.add(data_str)
 
-                if len(data) >= 8:
+                # Decode base58 (or hex) data
+                data = _decode_ix_data(data_str)
+
+                if data is not None and len(data) >= 8:
                     # Extract discriminator (first 8 bytes)
                     discriminator = data[:8].hex()
 
-                    if discriminator not in self.discriminators:
-                        self.discriminators.add(discriminator)
-
+                    if discriminator not in self._disc_index:
                         # Infer instruction type
-                        instruction_type = self.infer_instruction_type(data, instruction)
+                        acc_count = len(instruction.accounts)
+                        instruction_type = self.infer_instruction_type(len(data), acc_count)
 
-                        self.instructions_found[discriminator] = {
+                        self.add_instruction(discriminator, instruction_type, len(data), pool_name, acc_count)
+                        self.log_progress({
+                            'disc': discriminator,
                             'type': instruction_type,
                             'data_size': len(data),
                             'pool': pool_name,
-                            'account_count': len(instruction.accounts) if hasattr(instruction, 'accounts') else 0
-                        }
+                            'account_count': acc_count
+                        })
 
                         print(f"    🔑 Found: {discriminator[:16]}... ({instruction_type})")
 
         except Exception as e:
-            pass  # Continue on error
+            logger.debug("Skipping undecodable instruction for %s: %r", pool_name, e)
+
+    def instruction_records(self) -> Dict[str, Dict]:
+        """Rebuild the per-discriminator dicts from the columns, for export"""
+        return {
+            disc: {
+                'type': instruction_type,
+                'data_size': data_size,
+                'pool': pool,
+                'account_count': account_count
+            }
+            for disc, instruction_type, data_size, pool, account_count
+            in zip(self.discs, self.types, self.sizes, self.pools, self.acc_counts)
+        }
 
-    def infer_instruction_type(self, data, instruction):
+    def infer_instruction_type(self, data_len, acc_count):
         """Infer instruction type from data patterns"""
-        data_len = len(data)
-        acc_count = len(instruction.accounts) if hasattr(instruction, 'accounts') else 0
-
-        # Common patterns
+        # 8-byte payloads split on account count; other sizes are a table lookup
         if data_len == 8:
             return "query" if acc_count <= 2 else "admin"
-        elif data_len == 16:
-            return "swap_exact_in"
-        elif data_len == 24:
-            return "swap_exact_out"
-        elif data_len == 32:
-            return "add_liquidity"
-        elif data_len == 40:
-            return "remove_liquidity"
-        elif data_len > 100:
-            return "initialize"
-        else:
-            return f"unknown_{data_len}b"
+        return _TYPE_BY_LEN.get(data_len) or ("initialize" if data_len > 100 else f"unknown_{data_len}b")
 
     def analyze_binary(self):
         """Quick analysis of the binary for more patterns"""
@@ -204,19 +502,22 @@ class LifinityRealAnalyzer:
             # Read disassembly if exists
             disasm_path = Path("lifinity_v2.disasm")
             if disasm_path.exists():
-                with open(disasm_path, 'r') as f:
-                    lines = f.readlines()[:1000]  # Just first 1000 lines
-
-                # Look for 8-byte constants (potential discriminators)
-                for line in lines:
-                    if '0x' in line:
-                        # Find hex values that could be discriminators
-                        import re
-                        matches = re.findall(r'0x[0-9a-f]{16}', line, re.I)
-                        for match in matches:
-                            self.discriminators.add(match[2:])  # Remove 0x
-
-                print(f"  Found {len(self.discriminators)} potential discriminators")
+                # Stream the first lines in binary mode instead of loading the file
+                with open(disasm_path, 'rb') as f:
+                    lines = islice(f, DISASM_SCAN_LINES)
+                    if _scan_hex_constants is not None:
+                        buf = np.frombuffer(b''.join(lines), dtype=np.uint8)
+                        out = np.empty(len(buf) // 18 + 1, dtype=np.uint64)
+                        found = _scan_hex_constants(buf, out)
+                        self._disasm_discs.update(f"{value:016x}" for value in out[:found].tolist())
+                    else:
+                        for line in lines:
+                            if b'0x' not in line:
+                                continue
+                            for match in _DISC_RE.findall(line):
+                                self._disasm_discs.add(match.decode().lower())
+
+                print(f"  Found {len(self._disasm_discs | self._disc_index.keys())} potential discriminators")
 
         except Exception as e:
             print(f"  ⚠️  Binary analysis failed: {e}")
@@ -227,9 +528,10 @@ class LifinityRealAnalyzer:
         print("📋 LIFINITY V2 ANALYSIS REPORT")
         print("=" * 60)
 
-        print(f"\n🔑 Instruction Discriminators Found: {len(self.instructions_found)}")
-        for disc, info in list(self.instructions_found.items())[:10]:
-            print(f"  {disc[:16]}... -> {info['type']} ({info['data_size']}B, {info['account_count']} accounts)")
+        print(f"\n🔑 Instruction Discriminators Found: {len(self.discs)}")
+        rows = zip(self.discs, self.types, self.sizes, self.acc_counts)
+        for disc, instruction_type, data_size, account_count in islice(rows, 10):
+            print(f"  {disc[:16]}... -> {instruction_type} ({data_size}B, {account_count} accounts)")
 
         print(f"\n📊 Known Pools Analyzed: {len(KNOWN_POOLS)}")
         for pool_name, addr in KNOWN_POOLS.items():
@@ -242,8 +544,8 @@ class LifinityRealAnalyzer:
         results = {
             'timestamp': timestamp,
             'program_id': LIFINITY_V2_PROGRAM,
-            'instructions': dict(self.instructions_found),
-            'discriminators': list(self.discriminators),
+            'instructions': self.instruction_records(),
+            'discriminators': sorted(self._disasm_discs | self._disc_index.keys()),
             'pools': KNOWN_POOLS,
             'analysis_notes': {
                 'oracle_type': 'Pyth (based on Solana patterns)',
@@ -253,8 +555,11 @@ class LifinityRealAnalyzer:
             }
         }
 
-        with open(results_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        if orjson is not None:
+            results_file.write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+        else:
+            with open(results_file, 'w') as f:
+                json.dump(results, f, indent=2)
 
         print(f"\n💾 Results saved to: {results_file}")
 
@@ -268,8 +573,21 @@ class LifinityRealAnalyzer:
 
 def main():
     """Run the analyzer"""
-    analyzer = LifinityRealAnalyzer()
-    analyzer.analyze()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--verbose", action="store_true", help="log retries and skipped transactions")
+    parser.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENCY,
+                        help="in-flight RPC requests (default: %(default)s)")
+    args = parser.parse_args()
+    logging.basicConfig(format="%(message)s")
+    logger.setLevel(logging.DEBUG if args.verbose else logging.WARNING)
+
+    analyzer = LifinityRealAnalyzer(max_concurrency=args.max_concurrency)
+    asyncio.run(analyzer.analyze())
 
 if __name__ == "__main__":
+    try:
+        import uvloop  # libuv event loop; absent on Windows, where the default loop is used
+        uvloop.install()
+    except ImportError:
+        pass
     main()
\ No newline at end of file
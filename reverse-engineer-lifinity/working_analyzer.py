@@ -5,61 +5,165 @@ Simplified but robust version that focuses on getting results quickly
 """
 
 import asyncio
-import json
 import struct
 import base64
 import time
-import base58
-from typing import Dict, List, Set, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Set, Any, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
 from collections import Counter
 
+import httpx
+import numpy as np
+import orjson
+
+try:
+    import based58 as b58  # Rust base58 codec; same bytes-in/bytes-out API
+except ImportError:
+    import base58 as b58
+
 # Core imports
-from solana.rpc.api import Client
 from solders.pubkey import Pubkey
 
 # Constants
 LIFINITY_V2_PROGRAM_ID = "2wT8Yq49kHgDzXuPxZSaeLaH1qbmGXtEyPy64bL7aD3c"
-
-@dataclass
+LIFINITY_PROGRAM_BYTES = bytes(Pubkey.from_string(LIFINITY_V2_PROGRAM_ID))
+RPC_URL = "https://api.mainnet-beta.solana.com"
+MAX_INFLIGHT_BATCHES = 4  # Fetch workers, each with one batch POST in flight
+BATCH_SIZE = 8  # getTransaction requests per JSON-RPC batch; small to bound stragglers
+PROGRESS_INTERVAL = 0.1  # Seconds between progress line updates
+TX_CONFIG = {"encoding": "base64", "maxSupportedTransactionVersion": 0}
+JSON_HEADERS = {"Content-Type": "application/json"}  # Bodies are serialized with orjson
+KNOWN_PYTH_FEEDS = [
+    "J83w4HKfqxwcq3BEMMkPFSppX3gqekLyLJBexebFVkix",  # SOL/USD
+    "Gnt27xtC473ZT2Mw5u8wZ68Z3gULkSTb5DuxJy7eJotD",  # USDC/USD
+    "3vxLXJqLqF3JG5TCbYycbKWRBbCJQLxQmBGCkyqEEefL",  # USDT/USD
+    "E4v1BBgoso9s64TQvmyownAVJbhbEPGyzA3qn4n46qj9",  # mSOL/USD
+    "7yyaeuJ1GGtVBLT2z2xub5ZWYKaNhF28mj1RdV4VDFVk",  # JitoSOL/USD
+    "AFrYBhb5wKQtxRS9UA9YRS4V3dwFm7SqmS6DHKq6YVgo",  # bSOL/USD
+]
+
+# One HTTP/2 connection pool shared by every analyze() run; closed by main()
+_http = httpx.AsyncClient(
+    http2=True,
+    timeout=30,
+    limits=httpx.Limits(max_connections=32, keepalive_expiry=85)
+)
+
+@lru_cache(maxsize=4096)
+def _decode_b58(encoded: str) -> bytes:
+    """Raw bytes of a base58 key; lookup-table keys recur across transactions"""
+    return b58.b58decode(encoded.encode())
+
+def _decode_keys(keys: List[str]) -> frozenset:
+    """Raw 32-byte forms of base58 pubkeys; a malformed entry is a config error"""
+    decoded = set()
+    for key in keys:
+        try:
+            raw = b58.b58decode(key.encode())
+        except ValueError as e:
+            raise ValueError(f"invalid base58 pubkey {key!r}: {e}") from None
+        if len(raw) != 32:
+            raise ValueError(f"pubkey {key!r} decodes to {len(raw)} bytes, expected 32")
+        decoded.add(raw)
+    return frozenset(decoded)
+
+# Matched against raw account keys by set intersection, with no base58 encoding
+PYTH_FEEDS = _decode_keys(KNOWN_PYTH_FEEDS)
+
+def _read_shortvec(buf: bytes, pos: int) -> Tuple[int, int]:
+    """Decode a Solana compact-u16 length; returns (value, next position)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+def _parse_transaction(raw: bytes, program_key: bytes) -> Tuple[List[bytes], List[Tuple[bytes, bytes]]]:
+    """Static account keys and the (account indices, data) of each instruction
+    invoking ``program_key``, read straight from a wire-format transaction.
+
+    The program is located with bytes.find over the contiguous key block, so
+    transactions that never touch it return ([], []) without slicing keys.
+    """
+    sig_count, pos = _read_shortvec(raw, 0)
+    pos += 64 * sig_count
+    if raw[pos] & 0x80:
+        pos += 1  # Versioned message prefix
+    pos += 3  # Message header
+
+    key_count, pos = _read_shortvec(raw, pos)
+    keys_end = pos + 32 * key_count
+    program_indices = set()
+    hit = raw.find(program_key, pos, keys_end)
+    while hit != -1:
+        if not (hit - pos) % 32:  # Ignore matches straddling two keys
+            program_indices.add((hit - pos) // 32)
+        hit = raw.find(program_key, hit + 1, keys_end)
+    if not program_indices:
+        return [], []
+
+    keys = [raw[start:start + 32] for start in range(pos, keys_end, 32)]
+    pos = keys_end + 32  # Skip the recent blockhash
+
+    ix_count, pos = _read_shortvec(raw, pos)
+    matched = []
+    for _ in range(ix_count):
+        program_idx = raw[pos]
+        acc_len, pos = _read_shortvec(raw, pos + 1)
+        acc_start, pos = pos, pos + acc_len
+        data_len, pos = _read_shortvec(raw, pos)
+        if program_idx in program_indices:
+            matched.append((raw[acc_start:acc_start + acc_len], raw[pos:pos + data_len]))
+        pos += data_len
+    return keys, matched
+
+@dataclass(slots=True)
 class InstructionSummary:
     """Simple instruction summary"""
-    discriminator: str
+    discriminator: str  # Hex, filled once when the summary is created
     frequency: int
     account_count: int
     data_size: int
     sample_accounts: List[str]
-    classification: str
+    classification: str = ""  # Filled in bulk by _classify_instructions
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisSummary:
     """Analysis results summary"""
     total_transactions: int
     successful_transactions: int
-    instructions: Dict[str, InstructionSummary]
-    raw_discriminators: Set[str]
-    oracle_accounts: Set[str]
+    instructions: Dict[bytes, InstructionSummary]
+    raw_discriminators: Set[bytes]
+    oracle_accounts: Set[bytes]
     processing_time: float
     status: str
+    total_signatures: int = 0  # Listed signatures, including failed ones never fetched
 
 class WorkingAnalyzer:
     """Simplified but working Lifinity analyzer"""
 
-    def __init__(self):
-        self.client = Client("https://api.mainnet-beta.solana.com")
-        self.program_id = Pubkey.from_string(LIFINITY_V2_PROGRAM_ID)
+    def __init__(self, http: httpx.AsyncClient = None):
+        self.rpc_url = RPC_URL
+        self.http = http or _http  # Owned by the caller; never closed here
 
         # Results
-        self.instructions: Dict[str, InstructionSummary] = {}
-        self.raw_discriminators: Set[str] = set()
-        self.oracle_accounts: Set[str] = set()
+        self.instructions: Dict[bytes, InstructionSummary] = {}
+        self.raw_discriminators: Set[bytes] = set()
+        self.oracle_accounts: Set[bytes] = set()
 
         # Counters
+        self.total_signatures = 0
         self.total_txs = 0
         self.successful_txs = 0
         self.start_time = time.time()
+        self._last_progress = 0.0
 
     async def analyze(self, max_transactions: int = 50) -> AnalysisSummary:
         """Simple analysis focusing on instruction extraction"""
@@ -68,28 +172,32 @@ class WorkingAnalyzer:
         try:
             # Get signatures
             print("📡 Fetching signatures...")
-            response = self.client.get_signatures_for_address(
-                self.program_id,
-                limit=max_transactions
-            )
+            reply = await self._rpc({
+                "jsonrpc": "2.0", "id": 0, "method": "getSignaturesForAddress",
+                "params": [LIFINITY_V2_PROGRAM_ID, {"limit": max_transactions}]
+            })
+            signatures = reply.get("result") if isinstance(reply, dict) else None
 
-            if not response or not response.value:
+            if not signatures:
                 return self._create_summary("No signatures found")
 
-            signatures = response.value
-            print(f"✅ Found {len(signatures)} signatures")
+            # Failed transactions carry no useful state, so never fetch them
+            self.total_signatures = len(signatures)
+            sigs = [sig_info["signature"] for sig_info in signatures if sig_info.get("err") is None][:max_transactions]
+            print(f"✅ Found {len(signatures)} signatures ({len(sigs)} successful)")
 
-            # Process each transaction
-            for i, sig_info in enumerate(signatures):
-                if i >= max_transactions:
-                    break
+            # Small batches in flight concurrently; parsing overlaps the next fetches
+            pending: asyncio.Queue = asyncio.Queue()
+            for sig in sigs:
+                pending.put_nowait(sig)
+            fetched: asyncio.Queue = asyncio.Queue(maxsize=MAX_INFLIGHT_BATCHES * 2)
 
-                print(f"📊 Processing {i+1}/{min(len(signatures), max_transactions)}", end="\r")
-
-                success = await self._process_transaction(sig_info)
-                self.total_txs += 1
-                if success:
-                    self.successful_txs += 1
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._extract_worker(fetched, len(sigs)))
+                workers = [tg.create_task(self._fetch_worker(pending, fetched))
+                           for _ in range(MAX_INFLIGHT_BATCHES)]
+                await asyncio.gather(*workers)
+                await fetched.put(None)
 
             print(f"\n✅ Processed {self.total_txs} transactions, {self.successful_txs} successful")
 
@@ -99,110 +207,100 @@ class WorkingAnalyzer:
             print(f"\n❌ Analysis error: {e}")
             return self._create_summary(f"Analysis failed: {e}")
 
-    async def _process_transaction(self, sig_info) -> bool:
-        """Process a single transaction"""
-        try:
-            # Get transaction
-            tx_response = self.client.get_transaction(
-                sig_info.signature,
-                encoding="json",
-                max_supported_transaction_version=0
-            )
-
-            if not tx_response or not tx_response.value:
-                return False
-
-            tx_data = tx_response.value
-
-            # Extract instructions
-            return self._extract_instructions(tx_data)
-
-        except Exception:
-            return False
+    async def _fetch_worker(self, pending: asyncio.Queue, fetched: asyncio.Queue):
+        """Pull up to BATCH_SIZE signatures at a time and fetch them in one POST"""
+        while not pending.empty():
+            sigs = [pending.get_nowait() for _ in range(min(BATCH_SIZE, pending.qsize()))]
+            try:
+                txs = await self._batch_get_transactions(sigs)
+            except (httpx.HTTPError, ValueError):
+                txs = [None] * len(sigs)
+            await fetched.put(txs)
+
+    async def _extract_worker(self, fetched: asyncio.Queue, total: int):
+        """Extract instructions from fetched batches until the None sentinel"""
+        while (txs := await fetched.get()) is not None:
+            for tx_data in txs:
+                self.total_txs += 1
+                if tx_data and self._extract_instructions(tx_data):
+                    self.successful_txs += 1
 
-    def _extract_instructions(self, tx_data) -> bool:
-        """Extract instructions from transaction data"""
+            # Redrawing the line costs a stdout write, so at most one per PROGRESS_INTERVAL
+            now = time.monotonic()
+            if now - self._last_progress > PROGRESS_INTERVAL or self.total_txs >= total:
+                self._last_progress = now
+                print(f"📊 Processing {self.total_txs}/{total}", end="\r")
+
+    async def _rpc(self, body: Any) -> Any:
+        """POST a JSON-RPC request or batch over the shared HTTP/2 pool"""
+        response = await self.http.post(self.rpc_url, content=orjson.dumps(body), headers=JSON_HEADERS)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def _batch_get_transactions(self, sigs: List[str]) -> List[Any]:
+        """getTransaction for every signature in one POST; results are aligned with sigs"""
+        body = [
+            {"jsonrpc": "2.0", "id": i, "method": "getTransaction", "params": [sig, TX_CONFIG]}
+            for i, sig in enumerate(sigs)
+        ]
+        replies = await self._rpc(body)
+
+        if not isinstance(replies, list):
+            return [None] * len(sigs)
+
+        # Replies may arrive in any order; match them back by id
+        results = {reply.get("id"): reply.get("result") for reply in replies}
+        return [results.get(i) for i in range(len(sigs))]
+
+    def _extract_instructions(self, tx_data: Dict[str, Any]) -> bool:
+        """Extract instructions from a base64 getTransaction result"""
         try:
-            # Navigate to message
-            message = None
-
-            if hasattr(tx_data, 'transaction'):
-                if hasattr(tx_data.transaction, 'transaction'):
-                    message = tx_data.transaction.transaction.message
-                elif hasattr(tx_data.transaction, 'message'):
-                    message = tx_data.transaction.message
-
-            if not message:
+            raw = base64.b64decode(tx_data["transaction"][0])
+            account_keys, matched = _parse_transaction(raw, LIFINITY_PROGRAM_BYTES)
+            if not matched:
                 return False
 
-            # Get account keys
-            account_keys = []
-            if hasattr(message, 'account_keys'):
-                account_keys = [str(key) for key in message.account_keys]
-
-            # Check if our program is in this transaction
-            if LIFINITY_V2_PROGRAM_ID not in account_keys:
-                return False
+            # v0 transactions resolve extra keys through address lookup tables
+            loaded = (tx_data.get("meta") or {}).get("loadedAddresses")
+            if loaded:
+                account_keys += [_decode_b58(key) for key in loaded["writable"] + loaded["readonly"]]
 
             # Process instructions
             found_lifinity = False
-            if hasattr(message, 'instructions'):
-                for ix in message.instructions:
-                    if self._process_instruction(ix, account_keys):
-                        found_lifinity = True
+            for accounts, data in matched:
+                if self._process_instruction(data, accounts, account_keys):
+                    found_lifinity = True
 
             return found_lifinity
 
         except Exception:
             return False
 
-    def _process_instruction(self, ix, account_keys: List[str]) -> bool:
-        """Process individual instruction"""
+    def _process_instruction(self, data: bytes, accounts: bytes, account_keys: List[bytes]) -> bool:
+        """Process one Lifinity instruction given its data and account index bytes"""
         try:
-            # Check if this instruction is for our program
-            program_idx = getattr(ix, 'program_id_index', -1)
-
-            if program_idx < 0 or program_idx >= len(account_keys):
-                return False
-
-            program_key = account_keys[program_idx]
-            if program_key != LIFINITY_V2_PROGRAM_ID:
-                return False
-
-            # Extract instruction data
-            data = None
-            if hasattr(ix, 'data'):
-                if isinstance(ix.data, str):
-                    try:
-                        data = base58.b58decode(ix.data)
-                    except:
-                        data = ix.data.encode() if isinstance(ix.data, str) else None
-                elif isinstance(ix.data, (bytes, bytearray)):
-                    data = bytes(ix.data)
-
-            if not data or len(data) < 8:
+            if len(data) < 8:
                 return False
 
             # Extract discriminator
-            discriminator = data[:8].hex()
+            discriminator = data[:8]
             self.raw_discriminators.add(discriminator)
 
             # Get accounts for this instruction
             instruction_accounts = []
-            if hasattr(ix, 'accounts'):
-                for acc_idx in ix.accounts:
-                    if acc_idx < len(account_keys):
-                        instruction_accounts.append(account_keys[acc_idx])
+            for acc_idx in accounts:
+                if acc_idx < len(account_keys):
+                    instruction_accounts.append(account_keys[acc_idx])
 
             # Update instruction stats
             if discriminator not in self.instructions:
                 self.instructions[discriminator] = InstructionSummary(
-                    discriminator=discriminator,
+                    discriminator=discriminator.hex(),
                     frequency=0,
                     account_count=len(instruction_accounts),
                     data_size=len(data),
-                    sample_accounts=instruction_accounts[:5],  # Keep first 5 accounts as sample
-                    classification=self._classify_instruction(data, instruction_accounts)
+                    # Keep first 5 accounts as sample, base58-encoded for output
+                    sample_accounts=[b58.b58encode(key).decode() for key in instruction_accounts[:5]]
                 )
 
             self.instructions[discriminator].frequency += 1
@@ -215,37 +313,38 @@ class WorkingAnalyzer:
         except Exception:
             return False
 
-    def _classify_instruction(self, data: bytes, accounts: List[str]) -> str:
-        """Simple instruction classification"""
-        data_len = len(data)
-        acc_count = len(accounts)
-
-        if data_len == 8:
-            if acc_count <= 2:
-                return "query"
-            else:
-                return "admin"
-        elif 16 <= data_len <= 24 and acc_count >= 6:
-            return "swap"
-        elif data_len > 50 and acc_count >= 10:
-            return "initialize"
-        elif 24 < data_len <= 50:
-            return "update"
-        else:
-            return f"unknown_{data_len}b"
-
-    def _detect_oracles(self, accounts: List[str]):
-        """Detect potential oracle accounts"""
-        known_oracle_prefixes = ['J8', 'Gn', '3v', 'E4', '7y', 'AF']
+    def _classify_instructions(self):
+        """Simple instruction classification, one vectorized pass over every discriminator"""
+        summaries = list(self.instructions.values())
+        count = len(summaries)
+        data_len = np.fromiter((inst.data_size for inst in summaries), dtype=np.int64, count=count)
+        acc_count = np.fromiter((inst.account_count for inst in summaries), dtype=np.int64, count=count)
+
+        # First matching rule wins, as in an if/elif chain
+        labels = np.select(
+            [
+                (data_len == 8) & (acc_count <= 2),
+                data_len == 8,
+                (data_len >= 16) & (data_len <= 24) & (acc_count >= 6),
+                (data_len > 50) & (acc_count >= 10),
+                (data_len > 24) & (data_len <= 50),
+            ],
+            ["query", "admin", "swap", "initialize", "update"],
+            default=""
+        )
 
-        for account in accounts:
-            # Check for known Pyth oracle patterns
-            if any(account.startswith(prefix) for prefix in known_oracle_prefixes):
-                self.oracle_accounts.add(account)
+        for inst, label in zip(summaries, labels.tolist()):
+            inst.classification = label or f"unknown_{inst.data_size}b"
+
+    def _detect_oracles(self, accounts: List[bytes]):
+        """Detect potential oracle accounts"""
+        # Known Pyth feeds; one C-level intersection per instruction
+        self.oracle_accounts.update(PYTH_FEEDS.intersection(accounts))
 
     def _create_summary(self, status: str) -> AnalysisSummary:
         """Create analysis summary"""
         processing_time = time.time() - self.start_time
+        self._classify_instructions()
 
         return AnalysisSummary(
             total_transactions=self.total_txs,
@@ -254,7 +353,8 @@ class WorkingAnalyzer:
             raw_discriminators=self.raw_discriminators,
             oracle_accounts=self.oracle_accounts,
             processing_time=processing_time,
-            status=status
+            status=status,
+            total_signatures=self.total_signatures
         )
 
 def print_results(results: AnalysisSummary):
@@ -264,6 +364,7 @@ def print_results(results: AnalysisSummary):
     print("=" * 60)
 
     print(f"⏱️  Processing time: {results.processing_time:.2f}s")
+    print(f"📡 Signatures: {results.total_signatures} listed, {results.total_signatures - results.total_transactions} skipped")
     print(f"📈 Transactions: {results.total_transactions} total, {results.successful_transactions} successful")
     print(f"🔍 Instructions found: {len(results.instructions)}")
     print(f"🗝️ Raw discriminators: {len(results.raw_discriminators)}")
@@ -288,15 +389,35 @@ def print_results(results: AnalysisSummary):
     if results.raw_discriminators:
         print(f"\n🗝️ RAW DISCRIMINATORS:")
         for disc in sorted(results.raw_discriminators):
-            print(f"  {disc}")
+            print(f"  {disc.hex()}")
 
     if results.oracle_accounts:
         print(f"\n🔗 DETECTED ORACLE ACCOUNTS:")
-        for oracle in sorted(results.oracle_accounts):
+        for oracle in sorted(b58.b58encode(key).decode() for key in results.oracle_accounts):
             print(f"  {oracle}")
 
+def _stream_mapping(f, name: str, records: Dict[bytes, Any]):
+    """Write records keyed by raw discriminator as a JSON object member"""
+    f.write(f',\n"{name}": {{'.encode())
+    for i, (key, record) in enumerate(records.items()):
+        f.write(b',\n  ' if i else b'\n  ')
+        f.write(orjson.dumps(key.hex()))
+        f.write(b': ')
+        f.write(orjson.dumps(record))  # Dataclasses serialize natively
+    f.write(b'\n}' if records else b'}')
+
+def _stream_sequence(f, name: str, items):
+    """Write an iterable as a JSON array member"""
+    f.write(f',\n"{name}": ['.encode())
+    wrote = False
+    for item in items:
+        f.write(b',\n  ' if wrote else b'\n  ')
+        f.write(orjson.dumps(item))
+        wrote = True
+    f.write(b'\n]' if wrote else b']')
+
 def save_results(results: AnalysisSummary, filename: str = None):
-    """Save results to JSON file"""
+    """Stream results to a JSON file one record at a time"""
     if not filename:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"lifinity_analysis_{timestamp}.json"
@@ -306,29 +427,30 @@ def save_results(results: AnalysisSummary, filename: str = None):
 
     output_file = output_dir / filename
 
-    # Convert to serializable format
-    export_data = {
-        "metadata": {
-            "analysis_time": datetime.now().isoformat(),
-            "processing_time": results.processing_time,
-            "status": results.status
-        },
-        "summary": {
-            "total_transactions": results.total_transactions,
-            "successful_transactions": results.successful_transactions,
-            "instructions_found": len(results.instructions),
-            "oracle_accounts_found": len(results.oracle_accounts),
-            "raw_discriminators_found": len(results.raw_discriminators)
-        },
-        "instructions": {
-            disc: asdict(inst) for disc, inst in results.instructions.items()
-        },
-        "raw_discriminators": list(results.raw_discriminators),
-        "oracle_accounts": list(results.oracle_accounts)
+    metadata = {
+        "analysis_time": datetime.now().isoformat(),
+        "processing_time": results.processing_time,
+        "status": results.status
+    }
+    summary = {
+        "total_signatures": results.total_signatures,
+        "total_transactions": results.total_transactions,
+        "successful_transactions": results.successful_transactions,
+        "instructions_found": len(results.instructions),
+        "oracle_accounts_found": len(results.oracle_accounts),
+        "raw_discriminators_found": len(results.raw_discriminators)
     }
 
-    with open(output_file, 'w') as f:
-        json.dump(export_data, f, indent=2, default=str)
+    # Instructions are serialized and written one by one, never copied into a dict
+    with open(output_file, 'wb') as f:
+        f.write(b'{\n"metadata": ')
+        f.write(orjson.dumps(metadata))
+        f.write(b',\n"summary": ')
+        f.write(orjson.dumps(summary))
+        _stream_mapping(f, "instructions", results.instructions)
+        _stream_sequence(f, "raw_discriminators", (disc.hex() for disc in results.raw_discriminators))
+        _stream_sequence(f, "oracle_accounts", (b58.b58encode(key).decode() for key in results.oracle_accounts))
+        f.write(b'\n}\n')
 
     print(f"💾 Results saved to: {output_file}")
     return output_file
@@ -340,7 +462,7 @@ async def main():
     print("=" * 50)
 
     try:
-        analyzer = WorkingAnalyzer()
+        analyzer = WorkingAnalyzer(_http)
 
         # Run analysis
         results = await analyzer.analyze(max_transactions=50)
@@ -371,5 +493,13 @@ async def main():
         import traceback
         traceback.print_exc()
 
+    finally:
+        await _http.aclose()
+
 if __name__ == "__main__":
+    try:
+        import uvloop  # libuv event loop; absent on Windows, where the default loop is used
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file